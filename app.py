@@ -28,6 +28,15 @@ app.register_blueprint(resume_bp)
 app.register_blueprint(mcs_bp)
 app.register_blueprint(ask_bp)
 
+# Keep the AskAlum index in step with forum answers
+if FEATURE_FLAGS.get('ASK_ALUM') and os.getenv("ASK_ALUM_LIVE_INDEX", "true").lower() == "true":
+    from extensions.ask_alum import indexer as answer_indexer
+    answer_indexer.init_app(app)
+
+# Heavy AI dependencies load lazily; warm them up in the background once serving
+from extensions.ai.lazy import start_warmup
+start_warmup(app)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -238,6 +247,9 @@ def update_profile():
         user.email = request.form.get('email')
         user.contact = request.form.get('contact')
         user.course = request.form.get('course')
+        # Refresh just this user's stored mentor vector
+        from extensions.matching.mentor_vectors import vectorize_users
+        vectorize_users([user])
 
         # Update password if provided
         new_password = request.form.get('new_password')
@@ -285,6 +297,7 @@ def admin_dashboard_action(action=None):
             job_id = request.form.get('job_id')
             job = Job.query.get(job_id)
             if job:
+                # Its stored vector (JobVector) is deleted with it by cascade
                 db.session.delete(job)
                 db.session.commit()
                 flash('Job deleted successfully')
@@ -298,6 +311,9 @@ def admin_dashboard_action(action=None):
             job_description = request.form.get('job_description')
             new_job = Job(title=job_title, company=company, description=job_description, posted_by=current_user.id)
             db.session.add(new_job)
+            # Store the posting's TF-IDF vector and skills for resume matching
+            from extensions.ai.job_vectors import vectorize_job
+            vectorize_job(new_job)
             db.session.commit()
             flash('Job posted successfully')
             return redirect(url_for('admin_dashboard_action'))
@@ -340,6 +356,8 @@ def admin_dashboard_action(action=None):
             )
             new_user.set_password(password)
             db.session.add(new_user)
+            from extensions.matching.mentor_vectors import vectorize_users
+            vectorize_users([new_user])
             db.session.commit()
             flash(f'User {username} created successfully')
             return redirect(url_for('admin_dashboard_action'))
@@ -352,6 +370,9 @@ def admin_dashboard_action(action=None):
                 user.email = request.form.get('email')
                 user.name = request.form.get('name')
                 user.role = request.form.get('role')
+                # Role or profile changes touch only this user's mentor vector
+                from extensions.matching.mentor_vectors import vectorize_users
+                vectorize_users([user])
                 
                 new_password = request.form.get('password')
                 if new_password:
@@ -0,0 +1,99 @@
+"""
+FAISS index factory for the AskAlum retriever
+Supports exact search (flat) and approximate search (IVF-Flat, HNSW). Kept free
+of Flask imports so offline tools and benchmarks can build the same indexes.
+"""
+import math
+import os
+
+import numpy as np
+
+from .lazy import lazy_import
+
+# Loaded on first use; falsy if faiss is not installed
+faiss = lazy_import('faiss')
+
+INDEX_TYPES = ('flat', 'ivf', 'hnsw')
+
+IVF_NLIST = int(os.getenv("RAG_IVF_NLIST", "0"))  # 0 = derive from corpus size
+IVF_NPROBE = int(os.getenv("RAG_IVF_NPROBE", "16"))
+IVF_TRAIN_SAMPLE = int(os.getenv("RAG_IVF_TRAIN_SAMPLE", "100000"))
+HNSW_M = int(os.getenv("RAG_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("RAG_HNSW_EF_CONSTRUCTION", "80"))
+HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "64"))
+
+# faiss warns below ~39 training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def index_kind(index):
+    """Return 'flat', 'ivf' or 'hnsw' for a FAISS index."""
+    if isinstance(index, faiss.IndexIVF):
+        return 'ivf'
+    if isinstance(index, faiss.IndexHNSW):
+        return 'hnsw'
+    return 'flat'
+
+
+def ivf_nlist_for(n):
+    """Number of IVF cells for a corpus of n vectors (about 4 * sqrt(n))."""
+    if IVF_NLIST:
+        return IVF_NLIST
+    return max(1, min(int(4 * math.sqrt(n)), n // _MIN_POINTS_PER_CENTROID))
+
+
+def make_index(kind, dim, train_vectors=None, nlist=None, seed=1234):
+    """
+    Build an empty index of the given kind. IVF needs train_vectors; a random
+    sample of at most RAG_IVF_TRAIN_SAMPLE rows is used for k-means.
+    """
+    if not faiss:
+        raise RuntimeError("faiss not installed; install faiss-cpu for local RAG")
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {kind!r}; expected one of {INDEX_TYPES}")
+
+    if kind == 'flat':
+        return faiss.IndexFlatL2(dim)
+
+    if kind == 'hnsw':
+        index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+
+    if train_vectors is None or len(train_vectors) == 0:
+        raise ValueError("IVF index requires training vectors")
+    train_vectors = np.ascontiguousarray(train_vectors, dtype=np.float32)
+    nlist = nlist or ivf_nlist_for(len(train_vectors))
+    if len(train_vectors) > IVF_TRAIN_SAMPLE:
+        rng = np.random.default_rng(seed)
+        rows = rng.choice(len(train_vectors), IVF_TRAIN_SAMPLE, replace=False)
+        train_vectors = train_vectors[np.sort(rows)]
+    quantizer = faiss.IndexFlatL2(dim)
+    index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_L2)
+    index.train(train_vectors)
+    index.nprobe = min(IVF_NPROBE, nlist)
+    return index
+
+
+def all_vectors(index):
+    """Return every stored vector as an (ntotal, d) array."""
+    if index.ntotal == 0:
+        return np.empty((0, index.d), dtype=np.float32)
+    if index_kind(index) == 'ivf':
+        index.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def rebuild(index, kind, keep=None):
+    """
+    Copy the vectors of index into a freshly built index of the given kind.
+    keep optionally selects the rows to carry over (used for compaction).
+    """
+    vectors = all_vectors(index)
+    if keep is not None:
+        vectors = np.ascontiguousarray(vectors[keep])
+    new_index = make_index(kind, index.d, train_vectors=vectors if kind == 'ivf' else None)
+    if len(vectors):
+        new_index.add(vectors)
+    return new_index
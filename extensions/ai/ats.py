@@ -1,71 +1,65 @@
 """
 ATS (Applicant Tracking System) scoring module
-Parses resume files and scores them against job descriptions using TF-IDF
+Parses resume files and scores them against job descriptions using TF-IDF.
+Uses the corpus-level model from ats_model when one has been fitted.
+spaCy and scikit-learn load on first use (see lazy.py); pdfminer and
+python-docx only in the extraction workers (see extraction.py).
 """
 import os
+import threading
 from flask import current_app
 
-try:
-    from pdfminer.high_level import extract_text as extract_pdf_text
-except ImportError:
-    extract_pdf_text = None
+import numpy as np
+import re
 
-try:
-    import docx
-except ImportError:
-    docx = None
+from .ats_model import get_vectorizer
+from .extraction import extract_sandboxed
+from .skills import extract_skills
 
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-except Exception:
-    nlp = None
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
-import re
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
 
-def extract_text_from_file(file_path):
-    """Extract text from PDF, DOCX, or TXT files."""
+def get_nlp():
+    """The spaCy pipeline, loaded on first call; None if spaCy or the model is missing."""
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                try:
+                    import spacy
+                    _nlp = spacy.load("en_core_web_sm")
+                except Exception:
+                    _nlp = None
+                _nlp_loaded = True
+    return _nlp
+
+def extract_document(file_path):
+    """
+    Extract text from PDF, DOCX, or TXT files in a sandboxed, time-bounded
+    child process (see extraction.py). Returns an Extraction whose `partial`
+    flag is set when a size, page, time or memory limit cut the text short.
+    """
     try:
-        ext = file_path.rsplit('.', 1)[-1].lower()
-        
-        if ext == 'pdf':
-            if extract_pdf_text is None:
-                raise RuntimeError("pdfminer.six not installed")
-            return extract_pdf_text(file_path)
-        
-        elif ext in ('docx', 'doc'):
-            if docx is None:
-                raise RuntimeError("python-docx not installed")
-            doc = docx.Document(file_path)
-            return "\n".join(p.text for p in doc.paragraphs)
-        
-        elif ext == 'txt':
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
-        
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
-            
+        result = extract_sandboxed(file_path)
     except Exception as e:
         current_app.logger.error(f"Error extracting text from {file_path}: {e}")
         raise
+    if result.partial:
+        current_app.logger.warning(f"Partial text extracted from {file_path}: {result.reason}")
+    return result
+
+def extract_text_from_file(file_path):
+    """Extract text from PDF, DOCX, or TXT files (possibly partial, see extract_document)."""
+    return extract_document(file_path).text
 
 def extract_skills_simple(text, skill_vocab=None):
-    """Extract skills from text using a vocabulary list."""
-    text = text.lower()
-    if skill_vocab is None:
-        skill_vocab = [
-            'python', 'javascript', 'sql', 'java', 'c++', 'typescript',
-            'machine learning', 'nlp', 'deep learning', 'tensorflow', 'pytorch',
-            'react', 'angular', 'vue', 'node.js', 'flask', 'django',
-            'docker', 'kubernetes', 'aws', 'gcp', 'azure',
-            'git', 'jenkins', 'ci/cd', 'agile', 'scrum',
-            'communication', 'leadership', 'problem solving', 'teamwork'
-        ]
-    found = [s for s in skill_vocab if s in text]
-    return list(set(found))  # Remove duplicates
+    """
+    Extract skills from text using the skill taxonomy (or skill_vocab, a list
+    of skill names). Matches whole words only; see skills.py.
+    """
+    return extract_skills(text, skill_vocab)
 
 def extract_education(text):
     """Extract education mentions (simplified)."""
@@ -74,28 +68,50 @@ def extract_education(text):
     has_education = any(keyword in text_lower for keyword in education_keywords)
     return has_education
 
-def ats_score(resume_text, job_text):
+def pairwise_similarity(resume_text, job_text):
+    """
+    Cosine similarity from a vectorizer fitted on just these two texts.
+    Used when no corpus model has been fitted. Returns None if the resume
+    has no usable terms.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vect = TfidfVectorizer(stop_words='english', max_features=100)
+    try:
+        mat = vect.fit_transform([resume_text, job_text]).toarray()
+    except ValueError:
+        # Handle case where corpus is too small
+        return None
+    return float(
+        np.dot(mat[0], mat[1]) /
+        ((np.linalg.norm(mat[0]) * np.linalg.norm(mat[1])) + 1e-9)
+    )
+
+def model_similarity(vect, resume_text, job_text):
+    """Cosine similarity under a fitted corpus model (transform only)."""
+    mat = vect.transform([resume_text, job_text])
+    if not mat[0].nnz:
+        return None
+    # TfidfVectorizer rows are already L2-normalized
+    return float(mat[0].multiply(mat[1]).sum())
+
+def ats_score(resume_text, job_text, skills=None):
     """
     Score a resume against a job description using TF-IDF similarity.
+    Pass skills when they are already known (e.g. cached) to skip extraction.
     Returns (score: float, feedback: dict)
     """
     try:
-        # TF-IDF vectorization
-        vect = TfidfVectorizer(stop_words='english', max_features=100)
-        try:
-            mat = vect.fit_transform([resume_text, job_text]).toarray()
-        except ValueError:
-            # Handle case where corpus is too small
+        vect = get_vectorizer()
+        if vect is not None:
+            sim = model_similarity(vect, resume_text, job_text)
+        else:
+            sim = pairwise_similarity(resume_text, job_text)
+        if sim is None:
             return 0.0, {"error": "Resume too short to score"}
         
-        # Cosine similarity
-        sim = float(
-            np.dot(mat[0], mat[1]) / 
-            ((np.linalg.norm(mat[0]) * np.linalg.norm(mat[1])) + 1e-9)
-        )
-        
         # Extract features
-        skills = extract_skills_simple(resume_text)
+        if skills is None:
+            skills = extract_skills_simple(resume_text)
         has_education = extract_education(resume_text)
         
         # Calculate score (0-100)
@@ -0,0 +1,73 @@
+"""
+Corpus-level TF-IDF model for ATS scoring
+Fitted offline on job postings and past resumes (scripts/refit_ats_model.py),
+persisted with joblib and loaded once per worker, so scoring a resume only
+calls transform() and the IDF weights reflect the whole corpus. Workers
+reload it when another process rewrites the file (see tfidf_store.py).
+"""
+import os
+
+import numpy as np
+
+from .tfidf_store import PersistedModel
+
+MODEL_PATH = os.getenv("ATS_TFIDF_PATH", os.path.join("instance", "ats_tfidf.joblib"))
+MAX_FEATURES = int(os.getenv("ATS_TFIDF_MAX_FEATURES", "50000"))
+
+_model = PersistedModel(MODEL_PATH)
+
+
+def job_document(job):
+    """The text of a Job row that gets vectorized."""
+    parts = (job.title, job.company, job.description, job.requirements)
+    return "\n".join(p for p in parts if p)
+
+
+def make_vectorizer():
+    # Imported here so the app starts without loading scikit-learn
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(
+        stop_words='english',
+        ngram_range=(1, 2),
+        sublinear_tf=True,
+        max_features=MAX_FEATURES,
+        dtype=np.float32,
+    )
+
+
+def fit_vectorizer(corpus, path=None):
+    """
+    Fit a vectorizer on corpus (an iterable of texts), write it to path
+    (default MODEL_PATH) and make it this process's active model.
+    """
+    vect = make_vectorizer()
+    vect.fit(corpus)
+    _model.save(vect, path)
+    return vect
+
+
+def load_vectorizer(path=None):
+    """(Re)load the persisted model. Returns None if it has not been fitted yet."""
+    return _model.load(path)[0]
+
+
+def get_vectorizer():
+    """
+    The fitted model, loaded from disk on first use and reloaded when its
+    file changes (e.g. refit by another process); None if there is none.
+    """
+    return _model.get()[0]
+
+
+def get_model():
+    """(vectorizer, version) of the active model, read together; (None, None) if none."""
+    return _model.get()
+
+
+def model_version():
+    """
+    Content hash of the active model file, the same in every process that
+    loaded it; vectors computed under another version are stale. None when
+    no model has been fitted.
+    """
+    return _model.get()[1]
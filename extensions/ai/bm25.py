@@ -0,0 +1,96 @@
+"""
+Incremental inverted index with Okapi BM25 scoring
+Used for keyword retrieval when vector search or generation is unavailable.
+Documents are identified by their insertion position; removed documents are
+masked out of results rather than unlinked from the postings.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOP_WORDS = frozenset("""
+a about an and are as at be by can do does for from how i in is it me my of on or
+should so that the this to was what when where which who why will with you your
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens with stop words removed ('c++' and 'c#' survive)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS]
+
+
+class BM25Index:
+    """Term -> postings map that supports appending documents one at a time."""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}  # term -> ([doc positions], [term frequencies])
+        self._arrays = {}  # term -> (np doc positions, np tfs), built on demand
+        self._doc_len = []
+        self._total_len = 0
+        self._norm = None  # per-document length normalization, built on demand
+        self._removed = set()
+        self._removed_array = None
+
+    def __len__(self):
+        return len(self._doc_len)
+
+    def add(self, text):
+        """Index text as the next document; returns its position."""
+        doc = len(self._doc_len)
+        counts = Counter(tokenize(text))
+        for term, tf in counts.items():
+            docs, tfs = self._postings.setdefault(term, ([], []))
+            docs.append(doc)
+            tfs.append(tf)
+            self._arrays.pop(term, None)
+        length = sum(counts.values())
+        self._doc_len.append(length)
+        self._total_len += length
+        self._norm = None
+        return doc
+
+    def remove(self, doc):
+        """Exclude the document at position doc from future results."""
+        self._removed.add(doc)
+        self._removed_array = None
+
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            docs, tfs = self._postings[term]
+            arrays = (np.array(docs, dtype=np.int64), np.array(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def search(self, query, k=3):
+        """Return up to k (position, score) pairs, best first."""
+        n = len(self._doc_len)
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._postings]
+        if not n or not terms:
+            return []
+
+        if self._norm is None:
+            doc_len = np.asarray(self._doc_len, dtype=np.float32)
+            avg_len = max(self._total_len / n, 1e-9)
+            self._norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+        norm = self._norm
+        scores = np.zeros(n, dtype=np.float32)
+        for term in terms:
+            docs, tfs = self._term_arrays(term)
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+        if self._removed:
+            if self._removed_array is None:
+                self._removed_array = np.fromiter(self._removed, dtype=np.int64)
+            scores[self._removed_array] = 0
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(doc), float(scores[doc])) for doc in ranked]
@@ -0,0 +1,39 @@
+"""
+Split long advice posts into overlapping word windows for embedding
+Windows never cross paragraph boundaries, so editing one paragraph leaves the
+chunks of every other paragraph unchanged and their embeddings reusable.
+"""
+import os
+import re
+
+CHUNK_WORDS = int(os.getenv("RAG_CHUNK_WORDS", "200"))
+CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "40"))
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+def _windows(words, size, overlap):
+    stride = max(1, size - overlap)
+    for start in range(0, len(words), stride):
+        yield words[start:start + size]
+        if start + size >= len(words):
+            break
+
+
+def chunk_text(text, size=None, overlap=None):
+    """
+    Return the chunks of text. Text that fits in one window comes back
+    unchanged as a single chunk; longer text is split per paragraph into
+    windows of `size` words that overlap by `overlap` words.
+    """
+    size = size or CHUNK_WORDS
+    overlap = CHUNK_OVERLAP if overlap is None else overlap
+    if len(text.split()) <= size:
+        return [text]
+
+    chunks = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        words = paragraph.split()
+        if words:
+            chunks.extend(" ".join(window) for window in _windows(words, size, overlap))
+    return chunks
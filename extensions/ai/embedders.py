@@ -0,0 +1,77 @@
+"""
+Embedding backends for the RAG index
+`openai` calls the OpenAI embedding API; `hashing` is a local CPU backend built
+on scikit-learn's HashingVectorizer (no fitting, no network, deterministic).
+Pick one per deployment with RAG_EMBEDDER.
+"""
+import os
+
+import numpy as np
+
+from .llm_client import get_llm_client
+
+# Output dimension of the OpenAI embedding models we know about
+OPENAI_DIMS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+
+class Embedder:
+    """Turns a list of texts into an (n, dim) float32 array."""
+
+    name = "base"
+    dim = 0
+    # Remote backends are worth caching on disk and need network access
+    remote = False
+
+    def embed(self, texts):
+        raise NotImplementedError
+
+
+class OpenAIEmbedder(Embedder):
+    remote = True
+
+    def __init__(self, model, dim=None):
+        self.model = model
+        self.name = model
+        self.dim = dim or OPENAI_DIMS.get(model, 1536)
+
+    def embed(self, texts):
+        if not os.getenv("OPENAI_API_KEY"):
+            raise RuntimeError("OPENAI_API_KEY not set")
+        return np.array(get_llm_client().embed(texts, self.model), dtype=np.float32)
+
+
+class HashingEmbedder(Embedder):
+    """
+    Word unigram/bigram feature hashing into `dim` buckets, L2-normalized.
+    Lexical rather than semantic, but sub-millisecond and fully offline.
+    """
+
+    def __init__(self, dim=1024):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        self._vectorizer = HashingVectorizer(
+            n_features=dim,
+            ngram_range=(1, 2),
+            stop_words='english',
+            alternate_sign=False,
+            norm='l2',
+        )
+
+    def embed(self, texts):
+        return self._vectorizer.transform(list(texts)).toarray().astype(np.float32)
+
+
+def make_embedder(backend=None):
+    """Build the embedder named by backend (default RAG_EMBEDDER)."""
+    backend = (backend or os.getenv("RAG_EMBEDDER", "openai")).lower()
+    if backend == "openai":
+        dim = int(os.getenv("OPENAI_EMBEDDING_DIM", "0")) or None
+        return OpenAIEmbedder(os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"), dim)
+    if backend == "hashing":
+        return HashingEmbedder(int(os.getenv("RAG_HASHING_DIM", "1024")))
+    raise ValueError(f"Unknown RAG_EMBEDDER {backend!r}; expected 'openai' or 'hashing'")
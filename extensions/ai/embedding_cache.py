@@ -0,0 +1,119 @@
+"""
+Content-addressed on-disk cache for text embeddings
+Entries are keyed by model name plus SHA-256 of the text and stored in SQLite,
+so every worker process shares one cache. Least-recently-used rows are evicted
+once the table grows past max_entries.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used);
+"""
+
+# SQLite caps bound parameters per statement; stay well below the limit
+_SQL_CHUNK = 500
+
+
+def cache_key(model, text):
+    """Return the content address for text embedded with model."""
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU cache mapping (model, text) to float32 vectors."""
+
+    def __init__(self, path, max_entries=200000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, model, texts):
+        """Return {text: vector} for the texts present in the cache."""
+        keys = {cache_key(model, t): t for t in texts}
+        found = {}
+        conn = self._connect()
+        key_list = list(keys)
+        for start in range(0, len(key_list), _SQL_CHUNK):
+            chunk = key_list[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, blob in rows:
+                found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+
+        if found:
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, cache_key(model, t)) for t in found],
+                )
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model, texts, vectors):
+        """Store vectors for texts, then evict the oldest rows over the cap."""
+        now = time.time()
+        rows = [
+            (cache_key(model, t), model, np.asarray(v, dtype=np.float32).tobytes(), now)
+            for t, v in zip(texts, vectors)
+        ]
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        if not self.max_entries:
+            return
+        (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self):
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM embeddings")
+        self.hits = self.misses = 0
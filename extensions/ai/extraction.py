@@ -0,0 +1,188 @@
+"""
+Sandboxed, time-bounded document text extraction
+Each document is parsed in its own short-lived child process (forked from a
+clean forkserver, so it never inherits app threads or locks) under a byte-size
+cap, a page cap, a character cap, an address-space limit and a wall-clock
+deadline. The child streams text back page by page, so when a limit is hit
+the caller still gets everything extracted so far, flagged as partial,
+instead of a request worker hanging on one pathological PDF. At most
+EXTRACT_WORKERS children run at once.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, the deadline still applies
+    resource = None
+
+MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "30"))
+MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "200000"))
+TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "15"))
+MAX_MEMORY_MB = int(os.getenv("EXTRACT_MAX_MEMORY_MB", "768"))
+WORKERS = int(os.getenv("EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+
+# Why an extraction is partial
+TOO_LARGE = 'too_large'
+PAGE_LIMIT = 'page_limit'
+CHAR_LIMIT = 'char_limit'
+TIMEOUT_HIT = 'timeout'
+MEMORY_LIMIT = 'memory_limit'
+CRASHED = 'crashed'
+
+# Partial results that depend on load rather than on the file; not worth caching
+TRANSIENT = frozenset({TIMEOUT_HIT, CRASHED})
+
+Extraction = namedtuple('Extraction', 'text partial reason')
+
+_slots = threading.BoundedSemaphore(WORKERS)
+_context = None
+_context_lock = threading.Lock()
+
+
+def _get_context():
+    global _context
+    with _context_lock:
+        if _context is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _context = multiprocessing.get_context(method)
+    return _context
+
+
+def _pdf_pages(path, max_pages):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for page in extract_pages(path, maxpages=max_pages):
+        yield "".join(el.get_text() for el in page if isinstance(el, LTTextContainer))
+
+
+def _docx_parts(path):
+    import docx
+    doc = docx.Document(path)
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+
+def _txt_parts(path):
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for block in iter(lambda: f.read(64 * 1024), ''):
+            yield block
+
+
+def iter_text_parts(path, max_pages=None):
+    """Yield the text of a PDF page by page, a DOCX by paragraph, a TXT by block."""
+    ext = path.rsplit('.', 1)[-1].lower()
+    if ext == 'pdf':
+        try:
+            import pdfminer  # noqa: F401
+        except ImportError:
+            raise RuntimeError("pdfminer.six not installed")
+        return _pdf_pages(path, max_pages or 0)
+    if ext in ('docx', 'doc'):
+        try:
+            import docx  # noqa: F401
+        except ImportError:
+            raise RuntimeError("python-docx not installed")
+        return _docx_parts(path)
+    if ext == 'txt':
+        return _txt_parts(path)
+    raise ValueError(f"Unsupported file format: {ext}")
+
+
+def _limit_resources(memory_mb, cpu_seconds):
+    if resource is None:
+        return
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+
+
+def _child(conn, path, max_pages, max_chars, memory_mb, cpu_seconds):
+    """Child process: send ('part', text)... then ('done', reason) or ('error', kind, message)."""
+    try:
+        _limit_resources(memory_mb, cpu_seconds)
+        chars = pages = 0
+        reason = None
+        is_pdf = path.lower().endswith('.pdf')
+        # Ask for one page more than allowed to learn whether the PDF was cut short
+        for part in iter_text_parts(path, max_pages + 1):
+            if is_pdf and pages >= max_pages:
+                reason = PAGE_LIMIT
+                break
+            if chars + len(part) > max_chars:
+                conn.send(('part', part[:max_chars - chars]))
+                reason = CHAR_LIMIT
+                break
+            conn.send(('part', part))
+            chars += len(part)
+            pages += 1
+        conn.send(('done', reason))
+    except MemoryError:
+        conn.send(('done', MEMORY_LIMIT))
+    except Exception as e:
+        kind = 'value' if isinstance(e, ValueError) else 'runtime'
+        conn.send(('error', kind, str(e) or type(e).__name__))
+    finally:
+        conn.close()
+
+
+def extract_sandboxed(path, timeout=None, max_pages=None, max_chars=None, max_bytes=None, memory_mb=None):
+    """
+    Extract the text of path in a sandboxed child process. Returns an
+    Extraction(text, partial, reason); reason says which limit was hit.
+    Raises ValueError for unsupported formats and RuntimeError when the
+    parser is unavailable or fails outright.
+    """
+    timeout = TIMEOUT if timeout is None else timeout
+    max_pages = max_pages or MAX_PAGES
+    max_chars = max_chars or MAX_CHARS
+    max_bytes = max_bytes or MAX_BYTES
+    memory_mb = MAX_MEMORY_MB if memory_mb is None else memory_mb
+
+    if os.path.getsize(path) > max_bytes:
+        return Extraction("", True, TOO_LARGE)
+
+    ctx = _get_context()
+    with _slots:
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        cpu_seconds = int(timeout) + 1 if timeout else 0
+        proc = ctx.Process(target=_child, args=(send_conn, path, max_pages, max_chars, memory_mb, cpu_seconds),
+                           daemon=True)
+        proc.start()
+        send_conn.close()
+        parts, reason = [], None
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                # Checked before polling: a chatty child keeps the pipe readable
+                if (remaining is not None and remaining <= 0) or not recv_conn.poll(remaining):
+                    reason = TIMEOUT_HIT
+                    break
+                try:
+                    message = recv_conn.recv()
+                except (EOFError, OSError):
+                    # Killed by an rlimit or crashed without reporting back
+                    reason = CRASHED
+                    break
+                if message[0] == 'part':
+                    parts.append(message[1])
+                elif message[0] == 'done':
+                    reason = message[1]
+                    break
+                else:
+                    _, kind, text = message
+                    raise (ValueError if kind == 'value' else RuntimeError)(text)
+        finally:
+            recv_conn.close()
+            proc.join(0 if reason == TIMEOUT_HIT else 1)
+            if proc.is_alive():
+                proc.kill()
+            proc.join()
+    return Extraction("".join(parts), reason is not None, reason)
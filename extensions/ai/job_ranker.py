@@ -0,0 +1,84 @@
+"""
+Rank one resume against every Job posting at once
+All postings are kept as rows of one L2-normalized sparse TF-IDF matrix, so
+scoring a resume is a single sparse matrix-vector product followed by an
+argpartition top-k, instead of one ats_score call per job. The matrix is
+assembled from the vectors stored when jobs are posted (job_vectors.py), so a
+rebuild after a new posting does not re-vectorize every job.
+"""
+import threading
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, select
+
+from models import db, Job, JobVector
+from .ats_model import get_vectorizer, job_document, make_vectorizer
+from .job_vectors import load_matrix
+from .ranking import top_k
+
+# (signature, vectorizer, CSR matrix with one row per job, Job.id per row),
+# swapped as one tuple so readers never see a half-updated set
+_state = (None, None, None, None)
+_build_lock = threading.Lock()
+
+
+def _jobs_signature():
+    """
+    Cheap fingerprint of the Job table and the fitted model; changes when jobs
+    are added, removed or re-vectorized or the model is refitted. The newest
+    vector timestamp catches a delete followed by a post, which SQLite gives
+    the deleted job's id.
+    """
+    last_vectorized = select(func.max(JobVector.updated_at)).scalar_subquery()
+    count, max_id, last = db.session.query(func.count(Job.id), func.max(Job.id), last_vectorized).one()
+    return count, max_id, last, id(get_vectorizer())
+
+
+def _build_matrix(signature):
+    global _state
+    vect = get_vectorizer()
+    if vect is not None:
+        matrix, ids = load_matrix()
+    else:
+        # No corpus model fitted yet: fit one on the postings themselves
+        current_app.logger.warning("ATS model not fitted; fitting on job postings in memory")
+        rows = db.session.query(Job.id, Job.title, Job.company, Job.description, Job.requirements) \
+            .order_by(Job.id).all()
+        texts = [job_document(row) for row in rows]
+        vect = make_vectorizer().fit(texts or [''])
+        matrix = vect.transform(texts).tocsr() if texts else None
+        ids = np.array([row.id for row in rows], dtype=np.int64)
+    _state = (signature, vect, matrix, ids)
+    current_app.logger.info(f"Built job matrix for {len(ids)} postings")
+
+
+def _ensure_matrix():
+    signature = _jobs_signature()
+    if signature != _state[0]:
+        with _build_lock:
+            if signature != _state[0]:
+                _build_matrix(signature)
+    return _state[1:]
+
+
+def rank_jobs(resume_text, k=10):
+    """
+    Return the k best-matching postings for resume_text as a list of
+    (job_id, score) pairs, score being cosine similarity scaled to 0-100.
+    """
+    vect, matrix, ids = _ensure_matrix()
+    return rank_against(vect, matrix, ids, resume_text, k)
+
+
+def rank_against(vect, matrix, ids, resume_text, k=10):
+    """rank_jobs over an explicit job matrix (used by benchmarks and tests)."""
+    if matrix is None:
+        return []
+    query = vect.transform([resume_text])
+    if not query.nnz:
+        return []
+    # Sparse matrix times dense vector; sparse @ sparse is over 10x slower here
+    scores = matrix @ query.toarray().ravel()
+    best = top_k(scores, k)
+    return [(int(ids[i]), round(100 * float(scores[i]), 2)) for i in best if scores[i] > 0]
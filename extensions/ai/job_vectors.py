@@ -0,0 +1,118 @@
+"""
+Precomputed job-posting vectors
+Each Job's L2-normalized TF-IDF row under the fitted ATS model and its
+extracted skills are stored in a JobVector row when the job is posted, and go
+away with the job (ORM cascade) when it is deleted. Ranking and scoring read
+these rows instead of re-vectorizing posting text on every request. Rows
+computed under an older model or skills taxonomy are refreshed the first time
+they are read. Each operation takes the (vectorizer, version) pair once, so a
+model reloaded mid-way never labels vectors with the wrong version.
+"""
+import json
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+
+from models import db, Job, JobVector
+from .ats_model import get_model, job_document
+from .skills import get_skill_matcher
+from .tfidf_store import decode_row, encode_row, rows_to_csr
+
+REFRESH_BATCH = 500
+
+
+def vectorize_jobs(jobs, model=None):
+    """Compute and attach JobVector rows for jobs under model (default the active one); the caller commits."""
+    vect, version = model or get_model()
+    matcher = get_skill_matcher()
+    texts = [job_document(job) for job in jobs]
+    matrix = vect.transform(texts).tocsr() if vect is not None and texts else None
+    for i, (job, text) in enumerate(zip(jobs, texts)):
+        record = job.vector or JobVector()
+        if matrix is not None:
+            record.indices, record.weights = encode_row(matrix[i])
+        else:
+            record.indices = record.weights = None
+        record.model_version = version
+        record.skills = json.dumps(matcher.extract(text))
+        record.skills_version = matcher.version
+        job.vector = record
+
+
+def vectorize_job(job, model=None):
+    """Compute (or recompute) the stored vector and skills of one job."""
+    vectorize_jobs([job], model)
+    return job.vector
+
+
+def refresh_stale(model=None):
+    """Vectorize jobs with no stored row or one from another model/taxonomy. Returns the count."""
+    model = model or get_model()
+    version = model[1]
+    stale = or_(
+        JobVector.job_id.is_(None),
+        JobVector.skills_version != get_skill_matcher().version,
+        (JobVector.model_version.isnot(None) if version is None else
+         or_(JobVector.model_version.is_(None), JobVector.model_version != version)),
+    )
+    query = Job.query.outerjoin(JobVector).filter(stale).options(joinedload(Job.vector)).order_by(Job.id)
+    refreshed = 0
+    while True:
+        # Refreshed rows drop out of the filter, so always take the first batch
+        jobs = query.limit(REFRESH_BATCH).all()
+        if not jobs:
+            break
+        vectorize_jobs(jobs, model)
+        db.session.commit()
+        refreshed += len(jobs)
+    if refreshed:
+        current_app.logger.info(f"Refreshed stored vectors for {refreshed} jobs")
+    return refreshed
+
+
+def load_matrix():
+    """
+    (CSR matrix with one stored row per job, Job.id per row) under the fitted
+    model; the matrix is None when there are no jobs or no fitted model.
+    """
+    vect, version = get_model()
+    if vect is None:
+        return None, np.empty(0, dtype=np.int64)
+    refresh_stale((vect, version))
+    rows = db.session.query(JobVector.job_id, JobVector.indices, JobVector.weights) \
+        .join(Job, Job.id == JobVector.job_id) \
+        .filter(JobVector.model_version == version) \
+        .order_by(JobVector.job_id).all()
+    ids = np.array([row.job_id for row in rows], dtype=np.int64)
+    if not rows:
+        return None, ids
+    return rows_to_csr([(row.indices, row.weights) for row in rows], len(vect.vocabulary_)), ids
+
+
+def _current_record(job, model=None):
+    model = model or get_model()
+    record = job.vector
+    matcher = get_skill_matcher()
+    if record is None or record.model_version != model[1] or record.skills_version != matcher.version:
+        record = vectorize_job(job, model)
+        db.session.commit()
+    return record
+
+
+def job_vector(job):
+    """Dense stored TF-IDF vector of job, or None when no model is fitted."""
+    model = get_model()
+    if model[0] is None:
+        return None
+    record = _current_record(job, model)
+    dense = np.zeros(len(model[0].vocabulary_), dtype=np.float32)
+    indices, weights = decode_row(record.indices, record.weights)
+    dense[indices] = weights
+    return dense
+
+
+def job_skills(jobs):
+    """{job id: stored skill list} for jobs."""
+    return {job.id: json.loads(_current_record(job).skills or '[]') for job in jobs}
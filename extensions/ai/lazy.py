@@ -0,0 +1,81 @@
+"""
+Deferred imports for heavy optional dependencies
+lazy_import('faiss') returns a stand-in that imports the real module on first
+attribute access, so importing the app stays cheap and the cost is paid on
+first use, or ahead of time by start_warmup() once the server takes requests.
+A stand-in is falsy when the module is not installed, replacing the old
+`try: import x / except ImportError: x = None` pattern.
+"""
+import importlib
+import os
+import threading
+import time
+
+WARMUP = os.getenv("AI_WARMUP", "true").lower() == "true"
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None and self._error is None:
+            with self._lock:
+                if self._module is None and self._error is None:
+                    try:
+                        self._module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        self._error = e
+        return self._module
+
+    def __getattr__(self, attr):
+        module = self._load()
+        if module is None:
+            raise ImportError(f"{self._name} not installed") from self._error
+        return getattr(module, attr)
+
+    def __bool__(self):
+        return self._load() is not None
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def warm_up(logger=None):
+    """Import the heavy dependencies and load the models request paths need."""
+    started = time.perf_counter()
+    for name in ('scipy.sparse', 'sklearn.feature_extraction.text', 'faiss', 'pdfminer.high_level', 'docx'):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    from .ats_model import get_vectorizer
+    from .skills import get_skill_matcher
+    get_vectorizer()
+    get_skill_matcher()
+    if logger is not None:
+        logger.info(f"AI dependencies warmed up in {time.perf_counter() - started:.2f}s")
+
+
+def start_warmup(app):
+    """Warm up in a background thread once the app serves its first request."""
+    if not WARMUP:
+        return
+
+    def run():
+        try:
+            warm_up(app.logger)
+        except Exception as e:
+            app.logger.warning(f"AI warm-up failed: {e}")
+
+    @app.before_first_request
+    def _start():
+        threading.Thread(target=run, name='ai-warmup', daemon=True).start()
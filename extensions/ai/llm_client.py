@@ -0,0 +1,197 @@
+"""
+Shared HTTP client for the OpenAI-compatible chat and embedding endpoints
+One pooled session per process, per-call timeouts, a bulkhead that caps the
+number of in-flight upstream calls, and singleflight coalescing so identical
+concurrent requests share one upstream call. OPENAI_API_BASE can point it at
+a local fake server for tests.
+"""
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+DEFAULT_API_BASE = "https://api.openai.com/v1"
+
+
+class LLMError(RuntimeError):
+    """Upstream LLM call failed."""
+
+
+class LLMTimeoutError(LLMError):
+    """Upstream LLM call exceeded its timeout."""
+
+
+class LLMBusyError(LLMError):
+    """Too many LLM calls already in flight; the call was shed."""
+
+
+class _Call:
+    """A pending upstream call that followers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LLMClient:
+    def __init__(self, api_key=None, api_base=None, max_in_flight=8, timeout=30.0,
+                 connect_timeout=5.0, acquire_timeout=2.0):
+        if requests is None:
+            raise RuntimeError("requests package not installed")
+        self.api_key = api_key
+        self.api_base = (api_base or DEFAULT_API_BASE).rstrip('/')
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.acquire_timeout = acquire_timeout
+        self.max_in_flight = max_in_flight
+        self.coalesced = 0
+        self._bulkhead = threading.BoundedSemaphore(max_in_flight)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight, max_retries=0)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    # -- plumbing -----------------------------------------------------------
+
+    def _acquire(self):
+        if not self._bulkhead.acquire(timeout=self.acquire_timeout):
+            raise LLMBusyError(f"more than {self.max_in_flight} LLM calls in flight")
+
+    def _post(self, path, payload, timeout=None, stream=False):
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f"Bearer {self.api_key}"
+        try:
+            response = self._session.post(
+                f"{self.api_base}{path}",
+                data=json.dumps(payload),
+                headers=headers,
+                timeout=(self.connect_timeout, timeout or self.timeout),
+                stream=stream,
+            )
+        except requests.Timeout as e:
+            raise LLMTimeoutError(f"{path} timed out: {e}") from e
+        except requests.RequestException as e:
+            raise LLMError(f"{path} failed: {e}") from e
+        if response.status_code >= 400:
+            body = response.text[:200]
+            response.close()
+            raise LLMError(f"{path} returned HTTP {response.status_code}: {body}")
+        return response
+
+    def _singleflight(self, path, payload, timeout):
+        """POST payload once per distinct request among concurrent callers."""
+        key = hashlib.sha256(f"{path}\n{json.dumps(payload, sort_keys=True)}".encode('utf-8')).hexdigest()
+        with self._pending_lock:
+            call = self._pending.get(key)
+            leader = call is None
+            if leader:
+                call = self._pending[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            self._acquire()
+            try:
+                call.result = self._post(path, payload, timeout).json()
+            finally:
+                self._bulkhead.release()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._pending_lock:
+                self._pending.pop(key, None)
+            call.done.set()
+        return call.result
+
+    # -- API ----------------------------------------------------------------
+
+    def chat(self, messages, model, max_tokens=400, temperature=0.1, timeout=None):
+        """Return the completion text for messages."""
+        payload = {'model': model, 'messages': messages,
+                   'max_tokens': max_tokens, 'temperature': temperature}
+        data = self._singleflight('/chat/completions', payload, timeout)
+        try:
+            return data['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"malformed chat completion response: {e}") from e
+
+    def chat_stream(self, messages, model, max_tokens=400, temperature=0.1, timeout=None):
+        """Yield completion text deltas as the server streams them."""
+        payload = {'model': model, 'messages': messages, 'max_tokens': max_tokens,
+                   'temperature': temperature, 'stream': True}
+        self._acquire()
+        try:
+            response = self._post('/chat/completions', payload, timeout, stream=True)
+            with response:
+                try:
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith('data:'):
+                            continue
+                        data = line[len('data:'):].strip()
+                        if data == '[DONE]':
+                            break
+                        delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                        if delta:
+                            yield delta
+                except requests.Timeout as e:
+                    raise LLMTimeoutError(f"chat stream stalled: {e}") from e
+                except requests.RequestException as e:
+                    raise LLMError(f"chat stream failed: {e}") from e
+        finally:
+            self._bulkhead.release()
+
+    def embed(self, texts, model, timeout=None):
+        """Return one embedding (list of floats) per text, in input order."""
+        data = self._singleflight('/embeddings', {'model': model, 'input': list(texts)}, timeout)
+        try:
+            items = sorted(data['data'], key=lambda item: item['index'])
+            return [item['embedding'] for item in items]
+        except (KeyError, TypeError) as e:
+            raise LLMError(f"malformed embedding response: {e}") from e
+
+    def close(self):
+        self._session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def llm_configured():
+    """True when an API key is set and the HTTP client can be used."""
+    return requests is not None and bool(os.getenv("OPENAI_API_KEY"))
+
+
+def get_llm_client():
+    """Process-wide client configured from the environment."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    api_base=os.getenv("OPENAI_API_BASE", DEFAULT_API_BASE),
+                    max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", "8")),
+                    timeout=float(os.getenv("LLM_TIMEOUT", "30")),
+                    connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", "5")),
+                    acquire_timeout=float(os.getenv("LLM_ACQUIRE_TIMEOUT", "2")),
+                )
+    return _client
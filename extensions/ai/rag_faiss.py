@@ -1,139 +1,738 @@
 """
 RAG (Retrieval-Augmented Generation) module using FAISS and OpenAI
-Keeps index in-memory for development; use pgvector in production
+OpenAI calls go through the shared pooled client in llm_client.py.
+Keeps index in-memory for development; use pgvector in production.
+Snapshots can be saved to disk and memory-mapped back in at startup.
+Embeddings come from the backend selected by RAG_EMBEDDER (see embedders.py).
+Searches share a read lock and never block each other; writes take the write
+lock so readers always see the index and documents in step. Workers pick up
+snapshots saved by other processes without a restart (see maybe_reload_index).
+Documents are split into chunks (chunking.py), one FAISS row per chunk, and
+can be updated or deleted in place by their stable document id.
 """
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 import numpy as np
 from flask import current_app
 
-try:
-    import faiss
-except ImportError:
-    faiss = None
+from .ann_index import index_kind, make_index, rebuild
+from .bm25 import BM25Index
+from .chunking import chunk_text
+from .embedders import make_embedder
+from .embedding_cache import EmbeddingCache
+from .lazy import lazy_import
+from .llm_client import LLMError, get_llm_client, llm_configured
+from .rwlock import ReadWriteLock
+from .ttl_cache import TTLCache
+
+# Loaded on first use; falsy if faiss is not installed
+faiss = lazy_import('faiss')
 
 try:
-    import openai
-except ImportError:
-    openai = None
+    import fcntl
+except ImportError:  # Windows: single-process dev server only
+    fcntl = None
 
-EMB_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
 CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
-EMB_DIM = 1536  # dimension for text-embedding-3-small
+# flat (exact), ivf or hnsw; see extensions/ai/ann_index.py for tuning knobs.
+# IVF needs training data, so the index stays flat until RAG_IVF_MIN_DOCS.
+INDEX_TYPE = os.getenv("RAG_INDEX_TYPE", "flat").lower()
+IVF_MIN_DOCS = int(os.getenv("RAG_IVF_MIN_DOCS", "10000"))
+
+# On-disk snapshots: <INDEX_DIR>/v000001/{index.faiss,documents.json} plus a
+# CURRENT file naming the active snapshot.
+INDEX_DIR = os.getenv("RAG_INDEX_DIR", os.path.join("instance", "rag_index"))
+INDEX_KEEP = int(os.getenv("RAG_INDEX_KEEP", "3"))
+EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "256"))
+# Set RAG_EMBED_CACHE_PATH to an empty string to disable the embedding cache
+EMBED_CACHE_PATH = os.getenv("RAG_EMBED_CACHE_PATH", os.path.join("instance", "embedding_cache.sqlite3"))
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("RAG_EMBED_CACHE_MAX_ENTRIES", "200000"))
+QUERY_CACHE_TTL = float(os.getenv("RAG_QUERY_CACHE_TTL", "600"))
+QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "1024"))
+# Seconds between checks for a newer snapshot written by another process
+RELOAD_INTERVAL = float(os.getenv("RAG_RELOAD_INTERVAL", "5"))
+# Rebuild the index without deleted rows once they make up this share of it
+COMPACT_RATIO = float(os.getenv("RAG_COMPACT_RATIO", "0.25"))
+_INDEX_FILE = "index.faiss"
+_DOCS_FILE = "documents.json"
+_CURRENT_FILE = "CURRENT"
+_LOCK_FILE = ".write.lock"
 
 # In-memory store (dev-only). In prod use pgvector table.
 _index = None
-_documents = []  # list of dicts {'id':..., 'text':..., 'meta':...}
+# One entry per FAISS row: {'id': doc id, 'chunk': n, 'text': chunk text, 'meta': ...},
+# or None once the row has been deleted (a tombstone until the next compaction)
+_documents = []
+_doc_rows = {}  # doc id -> row positions of its live chunks, in chunk order
+_tombstones = 0
+_index_path = None  # snapshot file backing _index while it is memory-mapped
+_snapshot_version = 0
+_snapshot_checked = False
+_dirty = False  # local writes not yet saved to a snapshot
+_last_reload_check = 0.0
+_lock = ReadWriteLock()  # guards _index, _documents and _bm25 together
+_bm25_lock = threading.Lock()
+_save_lock = threading.Lock()
+# Serializes writers across chunk planning, embedding and commit; readers never take it
+_ingest_lock = threading.RLock()
+_embedding_cache = None
+_embedder = None
+_bm25 = BM25Index()  # keyword index over _documents, kept in step on each add
+# Bumped on every index mutation; cached answers from older versions are dropped
+_index_version = 0
+_query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
 
 def _ensure_index():
-    """Initialize FAISS index if not already done."""
-    global _index
-    if _index is None:
-        if faiss is None:
-            raise RuntimeError("faiss not installed; install faiss-cpu for local RAG")
-        _index = faiss.IndexFlatL2(EMB_DIM)
+    """Initialize FAISS index if not already done.
+
+    On first use the latest on-disk snapshot (if any) is memory-mapped in,
+    so a fresh worker does not need to re-embed the corpus.
+    """
+    global _index, _snapshot_checked
+    if _index is not None:
+        return
+    if not faiss:
+        raise RuntimeError("faiss not installed; install faiss-cpu for local RAG")
+    with _ingest_lock, _lock.write():
+        if _index is None and not _snapshot_checked:
+            _snapshot_checked = True
+            try:
+                load_index()
+            except Exception as e:
+                current_app.logger.warning(f"Could not load RAG snapshot: {e}")
+        if _index is None:
+            _index = make_index('flat' if INDEX_TYPE == 'ivf' else INDEX_TYPE, get_embedder().dim)
+
+def _bump_index_version():
+    """Record an index change and invalidate cached query results."""
+    global _index_version
+    _index_version += 1
+    _query_cache.clear()
+
+def _normalize_query(query):
+    return " ".join(query.lower().split()).rstrip("?!. ")
+
+def query_cache_stats():
+    """Hit/miss counters and occupancy of the query_rag result cache."""
+    stats = _query_cache.stats()
+    stats['index_version'] = _index_version
+    return stats
+
+def _writable_index():
+    """
+    Return the index, swapping a read-only mmapped snapshot for an owned copy.
+    Callers must hold the write lock.
+    """
+    global _index, _index_path
+    _ensure_index()
+    if _index_path is not None:
+        # Mapped pages are read-only; faiss aborts the process on add().
+        # Copy from memory: another process may already have pruned the file.
+        _index = faiss.deserialize_index(faiss.serialize_index(_index))
+        _index_path = None
+    return _index
+
+def _keyword_index():
+    """Return the BM25 index, indexing any documents it has not seen yet."""
+    with _bm25_lock:
+        for doc in _documents[len(_bm25):]:
+            pos = _bm25.add(doc['text'] if doc else '')
+            if doc is None:
+                _bm25.remove(pos)
+        return _bm25
+
+def _distinct_documents(rows, k):
+    """Map ranked rows to at most k live entries, one per document id."""
+    seen = set()
+    hits = []
+    for row in rows:
+        doc = _documents[row] if 0 <= row < len(_documents) else None
+        if doc is None or doc['id'] in seen:
+            continue
+        seen.add(doc['id'])
+        hits.append(doc)
+        if len(hits) == k:
+            break
+    return hits
+
+def _search_rows(qv, k):
+    """
+    Nearest k documents to qv, best chunk per document. Fetches more rows
+    when deleted rows or sibling chunks crowd the first page of results.
+    Callers must hold the read lock.
+    """
+    fetch = k
+    while True:
+        D, I = _index.search(np.array([qv]), fetch)
+        hits = _distinct_documents(I[0], k)
+        if len(hits) == k or fetch >= _index.ntotal:
+            return hits
+        fetch *= 4
+
+def keyword_search(query, k=3):
+    """BM25 keyword retrieval over the indexed documents, best match first."""
+    with _lock.read():
+        bm25 = _keyword_index()
+        fetch = k
+        while True:
+            with _bm25_lock:
+                ranked = bm25.search(query, fetch)
+            hits = _distinct_documents([pos for pos, _ in ranked], k)
+            if len(hits) == k or len(ranked) < fetch:
+                return hits
+            fetch *= 4
+
+def _rebuild_doc_rows():
+    """Recompute the id -> rows map and tombstone count from _documents."""
+    global _doc_rows, _tombstones
+    rows = {}
+    for row, doc in enumerate(_documents):
+        if doc is not None:
+            rows.setdefault(doc['id'], []).append(row)
+    for doc_rows in rows.values():
+        doc_rows.sort(key=lambda row: _documents[row].get('chunk', 0))
+    _doc_rows = rows
+    _tombstones = sum(doc is None for doc in _documents)
+
+def _tombstone(row):
+    global _tombstones
+    _documents[row] = None
+    _tombstones += 1
+    with _bm25_lock:
+        if row < len(_bm25):
+            _bm25.remove(row)
+
+def rebuild_index(kind=None):
+    """
+    Rebuild the index as the given type (default RAG_INDEX_TYPE) from the
+    vectors it already holds, dropping deleted rows and retraining IVF
+    centroids on the current corpus.
+    """
+    global _index, _documents, _index_path, _bm25, _dirty
+    kind = kind or INDEX_TYPE
+    with _ingest_lock, _lock.write():
+        _ensure_index()
+        started = time.perf_counter()
+        live = [row for row, doc in enumerate(_documents) if doc is not None]
+        _index = rebuild(_index, kind, keep=live if len(live) < len(_documents) else None)
+        _index_path = None
+        if len(live) < len(_documents):
+            _documents = [_documents[row] for row in live]
+            _bm25 = BM25Index()  # positions changed; refilled lazily
+            _rebuild_doc_rows()
+        _dirty = True
+        _bump_index_version()
+    current_app.logger.info(
+        f"Rebuilt RAG index as {kind} with {_index.ntotal} vectors in {time.perf_counter() - started:.2f}s"
+    )
+    return _index
+
+def compact_index():
+    """Drop deleted rows from the index, keeping its current type."""
+    _ensure_index()
+    return rebuild_index(index_kind(_index))
+
+def _maybe_compact_index():
+    if _documents and _tombstones > COMPACT_RATIO * len(_documents):
+        compact_index()
+
+def _maybe_upgrade_index():
+    """Switch a flat index to IVF once the corpus is large enough to train on."""
+    if INDEX_TYPE == 'ivf' and index_kind(_index) == 'flat' and _index.ntotal >= IVF_MIN_DOCS:
+        rebuild_index('ivf')
+
+def _read_current_version(index_dir):
+    try:
+        with open(os.path.join(index_dir, _CURRENT_FILE)) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+def _prune_snapshots(index_dir, keep):
+    versions = sorted(
+        int(name[1:]) for name in os.listdir(index_dir)
+        if name.startswith('v') and name[1:].isdigit()
+    )
+    for version in versions[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(index_dir, f"v{version:06d}"), ignore_errors=True)
+
+def save_index(index_dir=None):
+    """
+    Write the index and document store to a new versioned snapshot.
+    The snapshot directory is written in full before CURRENT is switched to
+    it, so readers never observe a half-written index. Returns the version.
+    """
+    global _snapshot_version, _dirty
+    index_dir = index_dir or INDEX_DIR
+    _ensure_index()
+    os.makedirs(index_dir, exist_ok=True)
+
+    # The read lock keeps writers out while searches carry on
+    with _save_lock, _lock.read():
+        version = max(_read_current_version(index_dir), _snapshot_version) + 1
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=index_dir)
+        try:
+            faiss.write_index(_index, os.path.join(tmp_dir, _INDEX_FILE))
+            with open(os.path.join(tmp_dir, _DOCS_FILE), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': version,
+                    'dim': _index.d,
+                    'embedder': get_embedder().name,
+                    'documents': _documents,
+                }, f)
+            os.rename(tmp_dir, os.path.join(index_dir, f"v{version:06d}"))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        current_tmp = os.path.join(index_dir, _CURRENT_FILE + f'.tmp{os.getpid()}')
+        with open(current_tmp, 'w') as f:
+            f.write(str(version))
+        os.replace(current_tmp, os.path.join(index_dir, _CURRENT_FILE))
+
+        _snapshot_version = version
+        _dirty = False
+        _prune_snapshots(index_dir, INDEX_KEEP)
+    current_app.logger.info(f"Saved RAG snapshot v{version} ({len(_documents)} documents)")
+    return version
+
+def load_index(index_dir=None, mmap=True):
+    """
+    Load the snapshot named by CURRENT. With mmap=True the vectors are mapped
+    read-only, so workers share the same physical pages; the first write
+    copies the index into process memory. Returns True if a snapshot loaded.
+    The snapshot is read before the write lock is taken, so searches only
+    pause for the pointer swap.
+    """
+    global _index, _documents, _index_path, _snapshot_version, _snapshot_checked, _bm25, _dirty
+    if not faiss:
+        raise RuntimeError("faiss not installed; install faiss-cpu for local RAG")
+    index_dir = index_dir or INDEX_DIR
+    _snapshot_checked = True
+    version = _read_current_version(index_dir)
+    if not version:
+        return False
+
+    snapshot = os.path.join(index_dir, f"v{version:06d}")
+    index_path = os.path.join(snapshot, _INDEX_FILE)
+    with open(os.path.join(snapshot, _DOCS_FILE), encoding='utf-8') as f:
+        payload = json.load(f)
+    embedder = get_embedder()
+    if payload.get('embedder', embedder.name) != embedder.name or payload.get('dim', embedder.dim) != embedder.dim:
+        raise RuntimeError(f"RAG snapshot v{version} was built with {payload.get('embedder')} "
+                           f"({payload.get('dim')}-d), not {embedder.name} ({embedder.dim}-d); re-import advice")
+    if mmap:
+        flags = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+        index = faiss.read_index(index_path, flags)
+    else:
+        index = faiss.read_index(index_path)
+    if index.ntotal != len(payload['documents']):
+        raise RuntimeError(f"RAG snapshot v{version} is inconsistent: "
+                           f"{index.ntotal} vectors, {len(payload['documents'])} documents")
+
+    documents = payload['documents']
+    # Taking the ingest lock keeps a writer from committing rows planned against the old state
+    with _ingest_lock, _lock.write():
+        # Keep the keyword index when the snapshot only appended documents
+        if documents[:len(_bm25)] != _documents[:len(_bm25)]:
+            _bm25 = BM25Index()  # refilled lazily by _keyword_index()
+        _index = index
+        _documents = documents
+        _rebuild_doc_rows()
+        _index_path = index_path if mmap else None
+        _snapshot_version = version
+        _dirty = False
+        _bump_index_version()
+    current_app.logger.info(f"Loaded RAG snapshot v{version} ({len(documents)} documents)")
+    return True
+
+def maybe_reload_index(index_dir=None, force=False):
+    """
+    Swap in a snapshot that another process saved since this one loaded.
+    Checks CURRENT at most once per RAG_RELOAD_INTERVAL seconds. Vectors are
+    memory-mapped, so nothing is re-embedded. Skipped while this process has
+    unsaved writes. Returns True if a newer snapshot was loaded.
+    """
+    global _last_reload_check
+    now = time.monotonic()
+    if _index is None or not faiss:
+        return False
+    if not force and now - _last_reload_check < RELOAD_INTERVAL:
+        return False
+    _last_reload_check = now
+    version = _read_current_version(index_dir or INDEX_DIR)
+    if version <= _snapshot_version:
+        return False
+    if _dirty:
+        current_app.logger.warning(
+            f"RAG snapshot v{version} is available but this worker has unsaved changes; not reloading"
+        )
+        return False
+    try:
+        return load_index(index_dir)
+    except Exception as e:
+        current_app.logger.warning(f"Could not reload RAG snapshot v{version}: {e}")
+        return False
+
+@contextmanager
+def index_transaction(index_dir=None):
+    """
+    Apply writes that every worker process must see. Holds an exclusive file
+    lock on the snapshot directory, catches up with the newest snapshot, runs
+    the block and saves a new snapshot, so writers in different processes
+    never overwrite each other's changes. Other workers hot-reload it.
+    """
+    index_dir = index_dir or INDEX_DIR
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, _LOCK_FILE), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            _ensure_index()
+            if _read_current_version(index_dir) > _snapshot_version:
+                if _dirty:
+                    current_app.logger.warning("Discarding unsaved RAG changes to catch up with a newer snapshot")
+                load_index(index_dir)
+            yield
+            save_index(index_dir)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _get_embedding_cache():
+    """Open the shared embedding cache on first use; None if disabled."""
+    global _embedding_cache
+    if _embedding_cache is None and EMBED_CACHE_PATH:
+        try:
+            _embedding_cache = EmbeddingCache(EMBED_CACHE_PATH, EMBED_CACHE_MAX_ENTRIES)
+        except Exception as e:
+            current_app.logger.warning(f"Embedding cache unavailable: {e}")
+            return None
+    return _embedding_cache
+
+def get_embedder():
+    """Return the process-wide embedder chosen by RAG_EMBEDDER."""
+    global _embedder
+    if _embedder is None:
+        _embedder = make_embedder()
+    return _embedder
+
+def _request_embeddings(texts):
+    """Embed texts with the configured backend, bypassing the cache."""
+    return get_embedder().embed(texts)
+
+def embed_texts(texts):
+    """
+    Embed a list of texts. For remote backends cached vectors are reused and
+    the misses are sent to the API in one call. Returns an (n, dim) array.
+    """
+    texts = list(texts)
+    embedder = get_embedder()
+    if not embedder.remote:
+        return np.asarray(_request_embeddings(texts), dtype=np.float32)
+
+    cache = _get_embedding_cache()
+    found = cache.get_many(embedder.name, texts) if cache is not None else {}
+    missing = [t for t in dict.fromkeys(texts) if t not in found]
+    if missing:
+        vecs = _request_embeddings(missing)
+        if cache is not None:
+            cache.put_many(embedder.name, missing, vecs)
+        found.update(zip(missing, vecs))
+    return np.array([found[t] for t in texts], dtype=np.float32)
 
 def embed_text(text: str):
-    """Get embedding vector for text using OpenAI."""
-    if openai is None:
-        raise RuntimeError("openai package not installed")
-    if not os.getenv("OPENAI_API_KEY"):
-        raise RuntimeError("OPENAI_API_KEY not set")
-    
-    response = openai.Embedding.create(model=EMB_MODEL, input=text)
-    return np.array(response["data"][0]["embedding"], dtype=np.float32)
+    """Get embedding vector for text (through the cache for remote backends)."""
+    return embed_texts([text])[0]
+
+def _plan_document(doc_id, text):
+    """
+    Chunk text and match the chunks against the document's live rows.
+    Returns (chunks, reused {chunk_no: row}, new chunk numbers).
+    """
+    chunks = chunk_text(text)
+    existing = {}
+    for row in _doc_rows.get(doc_id, ()):
+        existing.setdefault(_documents[row]['text'], row)
+    reused = {}
+    new = []
+    for chunk_no, chunk in enumerate(chunks):
+        row = existing.pop(chunk, None)
+        if row is None:
+            new.append(chunk_no)
+        else:
+            reused[chunk_no] = row
+    return chunks, reused, new
+
+def _upsert(docs):
+    """
+    Insert or replace documents given as (doc_id, text, meta) tuples.
+    Only chunks whose text is not already indexed for that document are
+    embedded; stale chunks are deleted. Returns the number of chunks embedded.
+    """
+    global _dirty
+    # Later entries for the same id win
+    docs = list({doc_id: (doc_id, text, meta) for doc_id, text, meta in docs}.values())
+    with _ingest_lock:
+        _ensure_index()
+        plans = [(doc_id, meta) + _plan_document(doc_id, text) for doc_id, text, meta in docs]
+        new_texts = [chunks[n] for _, _, chunks, _, new in plans for n in new]
+        vecs = np.ascontiguousarray(embed_texts(new_texts), dtype=np.float32) if new_texts else None
+
+        with _lock.write():
+            index = _writable_index()
+            if vecs is not None:
+                index.add(vecs)
+            for doc_id, meta, chunks, reused, new in plans:
+                rows = dict(reused)
+                for chunk_no in new:
+                    rows[chunk_no] = len(_documents)
+                    _documents.append({'id': doc_id, 'chunk': chunk_no, 'text': chunks[chunk_no], 'meta': meta or {}})
+                for chunk_no, row in reused.items():
+                    _documents[row]['chunk'] = chunk_no
+                    _documents[row]['meta'] = meta or {}
+                for row in set(_doc_rows.get(doc_id, ())) - set(reused.values()):
+                    _tombstone(row)
+                _doc_rows[doc_id] = [rows[n] for n in range(len(chunks))]
+            _keyword_index()
+            _dirty = True
+            _bump_index_version()
+            _maybe_compact_index()
+            _maybe_upgrade_index()
+    return len(new_texts)
 
 def add_document(doc_id, text, meta=None):
-    """Add a document to in-memory index. Call in admin/import step."""
+    """
+    Add a document to in-memory index, replacing any document with the same
+    id. Long texts are chunked. Call in admin/import step.
+    """
     try:
-        vec = embed_text(text)
-        _documents.append({'id': doc_id, 'text': text, 'meta': meta or {}})
-        _ensure_index()
-        _index.add(np.array([vec]))
-        current_app.logger.info(f"Added document {doc_id} to RAG index")
+        embedded = _upsert([(doc_id, text, meta)])
+        current_app.logger.info(f"Added document {doc_id} to RAG index ({embedded} chunks embedded)")
     except Exception as e:
         current_app.logger.error(f"Error adding document {doc_id}: {e}")
         raise
 
-def query_rag(query: str, k: int = 3):
+def update_document(doc_id, text, meta=None):
     """
-    Query RAG index and generate answer using OpenAI.
-    Returns (answer, source_ids) or uses fallback if deps missing.
+    Replace a document's text in place. Chunks that did not change keep
+    their vectors; only new or edited chunks are re-embedded.
     """
-    # Graceful fallback: if no OpenAI key, use static demo answer
-    if not os.getenv("OPENAI_API_KEY"):
-        current_app.logger.warning("OPENAI_API_KEY not set; using static fallback answer")
-        # Return static helpful response from sample advice
-        return (
-            "Based on campus resources: Focus on internships and practical projects to build your portfolio. "
-            "Learn in-demand skills like Python and SQL. Network with alumni during campus events. "
-            "We recommend reaching out to the alumni network directly for personalized advice.",
-            []
+    return add_document(doc_id, text, meta)
+
+def delete_document(doc_id):
+    """Remove a document and all its chunks. Returns False if it was not indexed."""
+    global _dirty
+    with _ingest_lock, _lock.write():
+        rows = _doc_rows.pop(doc_id, None)
+        if rows is None:
+            return False
+        for row in rows:
+            _tombstone(row)
+        _dirty = True
+        _bump_index_version()
+        _maybe_compact_index()
+    current_app.logger.info(f"Deleted document {doc_id} from RAG index ({len(rows)} chunks)")
+    return True
+
+def add_documents(docs, batch_size=None, on_batch=None):
+    """
+    Bulk-add documents given as (doc_id, text) or (doc_id, text, meta) tuples.
+    Documents are upserted batch_size at a time; the new chunks of a batch
+    are embedded together and added to FAISS as one contiguous array.
+    on_batch(stats) is called after every batch with the batch number, size,
+    chunks embedded, elapsed seconds and docs/sec. Returns the count.
+    """
+    batch_size = batch_size or EMBED_BATCH_SIZE
+    total = 0
+    batch = []
+    batch_no = 0
+
+    def flush():
+        nonlocal total, batch_no
+        started = time.perf_counter()
+        embedded = _upsert(batch)
+        elapsed = time.perf_counter() - started
+        batch_no += 1
+        total += len(batch)
+        stats = {
+            'batch': batch_no,
+            'size': len(batch),
+            'chunks_embedded': embedded,
+            'seconds': round(elapsed, 3),
+            'docs_per_sec': round(len(batch) / elapsed, 1) if elapsed > 0 else float('inf'),
+            'total': total,
+        }
+        current_app.logger.info(
+            f"RAG batch {batch_no}: {stats['size']} docs in {stats['seconds']}s "
+            f"({stats['docs_per_sec']} docs/s, {total} total)"
         )
-    if faiss is None and _documents:
+        if on_batch is not None:
+            on_batch(stats)
+        batch.clear()
+
+    try:
+        for doc in docs:
+            doc_id, text, meta = (tuple(doc) + (None,))[:3]
+            batch.append((doc_id, text, meta))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    except Exception as e:
+        current_app.logger.error(f"Error bulk-adding documents after {total} succeeded: {e}")
+        raise
+    return total
+
+_NO_KEY_ANSWER = (
+    "Based on campus resources: Focus on internships and practical projects to build your portfolio. "
+    "Learn in-demand skills like Python and SQL. Network with alumni during campus events. "
+    "We recommend reaching out to the alumni network directly for personalized advice."
+)
+_EMPTY_INDEX_ANSWER = (
+    "Our alumni database is being populated. Please check back soon for personalized advice from alumni mentors."
+)
+
+def _extractive_answer(docs):
+    return " ".join(d['text'] for d in docs) if docs else "No matching advice found."
+
+def _keyword_fallback(query, k, error):
+    """Concatenate keyword-matching documents when AI generation is unavailable."""
+    current_app.logger.warning(f"OpenAI generation failed: {error}; falling back to extractive answer")
+    matching = keyword_search(query, k)
+    return _extractive_answer(matching), [d['id'] for d in matching]
+
+def _build_messages(query, retrieved):
+    # Build context from retrieved documents
+    context = "\n\n---\n\n".join([r['text'] for r in retrieved]) if retrieved else ""
+
+    prompt = (
+        "You are AskAlum, a campus-specific career mentor assistant for Gradlink. "
+        "Use only the following verified alumni advice to answer. "
+        "If none is relevant, say you cannot answer and suggest escalating to a mentor.\n\n"
+        f"Alumni Advice:\n{context}\n\nStudent Question: {query}\n\nAnswer:"
+    )
+    return [
+        {"role": "system", "content": "You are a helpful career mentor assistant."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _prepare_query(query, k):
+    """
+    Run everything in front of answer generation: fallbacks, the result
+    cache and retrieval. Returns (answer, source_ids, messages, cache_key);
+    answer is None when messages still have to be sent to the chat model.
+    """
+    has_chat = llm_configured()
+    # Graceful fallback: with neither an OpenAI key nor a local embedder, use static demo answer
+    if not os.getenv("OPENAI_API_KEY") and get_embedder().remote:
+        current_app.logger.warning("OPENAI_API_KEY not set; using static fallback answer")
+        return _NO_KEY_ANSWER, [], None, None
+    if faiss:
+        _ensure_index()
+        maybe_reload_index()
+    if not faiss and _documents:
         current_app.logger.warning("faiss not available; using simple text search fallback")
     if len(_documents) == 0:
         current_app.logger.warning("RAG index is empty; returning static response")
-        return (
-            "Our alumni database is being populated. Please check back soon for personalized advice from alumni mentors.",
-            []
-        )
+        return _EMPTY_INDEX_ANSWER, [], None, None
+
+    cache_key = (_index_version, _normalize_query(query), k)
+    cached = _query_cache.get(cache_key)
+    if cached is not None:
+        current_app.logger.info("RAG query served from result cache")
+        return cached[0], list(cached[1]), None, None
 
     try:
         # Try full OpenAI + FAISS flow if available
-        if openai is None:
-            raise ImportError("OpenAI not installed")
-        
-        # Get query embedding
+        if get_embedder().remote and not has_chat:
+            raise ImportError("requests not installed; cannot reach OpenAI")
+
+        # Get query embedding and search FAISS index
         qv = embed_text(query)
-        
-        # Search FAISS index
-        D, I = _index.search(np.array([qv]), k)
-        retrieved = []
-        for idx in I[0]:
-            if 0 <= idx < len(_documents):
-                retrieved.append(_documents[idx])
-        
-        # Build context from retrieved documents
-        context = "\n\n---\n\n".join([r['text'] for r in retrieved]) if retrieved else ""
-        
-        prompt = (
-            "You are AskAlum, a campus-specific career mentor assistant for Gradlink. "
-            "Use only the following verified alumni advice to answer. "
-            "If none is relevant, say you cannot answer and suggest escalating to a mentor.\n\n"
-            f"Alumni Advice:\n{context}\n\nStudent Question: {query}\n\nAnswer:"
-        )
-        
-        # Generate answer
-        chat_response = openai.ChatCompletion.create(
-            model=CHAT_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful career mentor assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=400,
-            temperature=0.1
-        )
-        
-        answer = chat_response['choices'][0]['message']['content'].strip()
-        source_ids = [r['id'] for r in retrieved]
-        
+        with _lock.read():
+            retrieved = _search_rows(qv, k)
+    except (ImportError, AttributeError, KeyError, LLMError) as e:
+        answer, source_ids = _keyword_fallback(query, k, e)
+        return answer, source_ids, None, None
+
+    source_ids = [r['id'] for r in retrieved]
+    if not has_chat:
+        # Local embedder but no chat model: answer extractively from the retrieved advice
+        answer = _extractive_answer(retrieved)
+        _query_cache.set(cache_key, (answer, tuple(source_ids)))
+        return answer, source_ids, None, None
+    return None, source_ids, _build_messages(query, retrieved), cache_key
+
+def query_rag(query: str, k: int = 3):
+    """
+    Query RAG index and generate answer using OpenAI.
+    Returns (answer, source_ids) or uses fallback if deps missing.
+    Generated answers are cached per (normalized query, k) for
+    RAG_QUERY_CACHE_TTL seconds or until the index changes.
+    """
+    try:
+        answer, source_ids, messages, cache_key = _prepare_query(query, k)
+        if answer is not None:
+            return answer, source_ids
+
+        # Generate answer; identical concurrent questions share one upstream call
+        answer = get_llm_client().chat(messages, CHAT_MODEL, max_tokens=400, temperature=0.1).strip()
+
         current_app.logger.info(f"RAG query successful: {len(source_ids)} sources used")
+        _query_cache.set(cache_key, (answer, tuple(source_ids)))
         return answer, source_ids
-        
-    except (ImportError, AttributeError, KeyError) as e:
-        # Fallback: concatenate matching documents without AI
-        current_app.logger.warning(f"OpenAI generation failed: {e}; falling back to extractive answer")
-        q_lower = query.lower()
-        matching = [d for d in _documents if any(word in d['text'].lower() for word in q_lower.split())][:k]
-        fallback_answer = " ".join([d['text'] for d in matching]) if matching else "No matching advice found."
-        return fallback_answer, [d['id'] for d in matching]
-        
+
+    except (ImportError, AttributeError, KeyError, LLMError) as e:
+        return _keyword_fallback(query, k, e)
+
     except Exception as e:
         current_app.logger.exception("RAG query failed")
         raise
 
+def stream_rag(query: str, k: int = 3):
+    """
+    Streaming variant of query_rag. Yields ('sources', source_ids) as soon as
+    retrieval is done, then ('token', text) chunks as the model produces
+    them. Cached and fallback answers arrive as a single token event.
+    """
+    answer, source_ids, messages, cache_key = _prepare_query(query, k)
+    if answer is not None:
+        yield 'sources', source_ids
+        yield 'token', answer
+        return
+
+    yield 'sources', source_ids
+    parts = []
+    try:
+        for delta in get_llm_client().chat_stream(messages, CHAT_MODEL, max_tokens=400, temperature=0.1):
+            parts.append(delta)
+            yield 'token', delta
+    except (ImportError, AttributeError, KeyError, LLMError) as e:
+        if parts:
+            raise
+        answer, _ = _keyword_fallback(query, k, e)
+        yield 'token', answer
+        return
+
+    answer = "".join(parts).strip()
+    current_app.logger.info(f"RAG stream successful: {len(source_ids)} sources used")
+    _query_cache.set(cache_key, (answer, tuple(source_ids)))
+
 def clear_index():
-    """Clear the in-memory index (for testing)."""
-    global _index, _documents
-    _index = None
-    _documents = []
+    """Clear the in-memory index. On-disk snapshots are kept but not reloaded."""
+    global _index, _documents, _index_path, _snapshot_checked, _bm25, _dirty
+    with _ingest_lock, _lock.write():
+        _index = None
+        _documents = []
+        _rebuild_doc_rows()
+        _bm25 = BM25Index()
+        _index_path = None
+        _snapshot_checked = True
+        _dirty = True
+        _bump_index_version()
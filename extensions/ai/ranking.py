@@ -0,0 +1,24 @@
+"""
+Top-k selection over score arrays
+Shared by job ranking, live mentor matching and the nightly mentor batch:
+argpartition finds the k best in linear time, then only those k are sorted.
+"""
+import numpy as np
+
+
+def top_k(scores, k):
+    """
+    Indices of the k highest scores along the last axis, best first. On a
+    2-D array each row is ranked separately.
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        idx = np.broadcast_to(np.arange(n), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(idx, order, axis=-1)
@@ -0,0 +1,117 @@
+"""
+Skill extraction over a skill taxonomy
+The taxonomy (canonical skill -> aliases, loaded from SKILLS_TAXONOMY) is
+compiled once into a trie over word tokens. Extraction tokenizes the text and
+walks the trie from each token, taking the longest match, so a resume is
+scanned in one pass whatever the taxonomy size, and skills only ever match
+whole words ("java" never matches inside "javascript", nor "git" in "digital").
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'skills_taxonomy.json')),
+)
+
+# Words may carry + # . inside or at the end (c++, c#, node.js) and a leading
+# dot (.net); a trailing full stop is sentence punctuation, not part of a word
+_TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#.]*")
+
+_END = None  # trie key marking the end of a skill: value is the canonical name
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def tokenize(text):
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip('.')
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy):
+        """taxonomy: mapping of canonical skill name -> iterable of aliases."""
+        self._trie = {}
+        self.size = 0
+        # Changes whenever the taxonomy does; cached extractions are keyed by it
+        canonical_json = json.dumps({k: sorted(v) for k, v in taxonomy.items()}, sort_keys=True)
+        self.version = hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()[:16]
+        for canonical, aliases in taxonomy.items():
+            for phrase in (canonical, *aliases):
+                self._insert(phrase, canonical)
+
+    def _insert(self, phrase, canonical):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = canonical
+
+    def extract(self, text):
+        """Canonical skills mentioned in text, in order of first mention."""
+        tokens = tokenize(text)
+        found = {}
+        trie = self._trie
+        i, n = 0, len(tokens)
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            match, end = node.get(_END), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, end = node[_END], j
+            if match is not None:
+                found.setdefault(match, None)
+                i = end
+            else:
+                i += 1
+        return list(found)
+
+
+def load_taxonomy(path=None):
+    """Read a taxonomy file: {"skills": {canonical: [alias, ...]}}."""
+    with open(path or TAXONOMY_PATH, encoding='utf-8') as f:
+        return json.load(f)['skills']
+
+
+def get_skill_matcher():
+    """Matcher for the configured taxonomy, compiled once per process."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+def extract_skills(text, skill_vocab=None):
+    """
+    Skills in text from the configured taxonomy, or from skill_vocab (a list
+    of skill names, or a canonical -> aliases mapping) when given.
+    """
+    if skill_vocab is None:
+        matcher = get_skill_matcher()
+    elif isinstance(skill_vocab, dict):
+        matcher = SkillMatcher(skill_vocab)
+    else:
+        matcher = SkillMatcher({s: () for s in skill_vocab})
+    return matcher.extract(text or "")
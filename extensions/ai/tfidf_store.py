@@ -0,0 +1,118 @@
+"""
+Persisted TF-IDF models and their stored sparse rows
+Shared by the ATS model (ats_model.py, job_vectors.py) and the mentor model
+(extensions/matching/mentor_vectors.py). A model file is written atomically
+and versioned by a content hash, the same in every process; a process that
+loaded it reloads it when another one rewrites the file, so nobody keeps
+storing rows under a replaced model. Rows are stored as int32 column indices
+and float32 weights.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+
+def file_version(path):
+    """First 16 hex digits of the sha256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def file_stat(path):
+    """(mtime_ns, size) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PersistedModel:
+    """A joblib model file, loaded on first use and reloaded whenever the file changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._model = (None, None)  # (model, version), swapped as one tuple
+        self._stat = None  # file_stat of path when loaded or saved
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _replaced(self):
+        # A deleted file keeps the model in memory
+        return file_stat(self.path) not in (None, self._stat)
+
+    def _load(self):
+        # Stat before reading, so a rewrite during the load is picked up next time
+        self._stat = file_stat(self.path)
+        if self._stat is not None:
+            import joblib
+            self._model = (joblib.load(self.path), file_version(self.path))
+        else:
+            self._model = (None, None)
+        self._loaded = True
+
+    def get(self):
+        """(model, version); (None, None) while no model file exists."""
+        if not self._loaded or self._replaced():
+            # Re-checked under the lock so a concurrent save is never overwritten
+            with self._lock:
+                if not self._loaded or self._replaced():
+                    self._load()
+        return self._model
+
+    def load(self, path=None):
+        """(Re)load the model from path (default the current one) and follow that file."""
+        with self._lock:
+            self.path = path or self.path
+            self._load()
+        return self._model
+
+    def save(self, model, path=None):
+        """
+        Write model to path (default the current one), make it the active
+        model and follow that file. Returns its version.
+        """
+        import joblib
+        path = path or self.path
+        # Write next to the target and rename, so workers never load a partial file
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+        os.close(fd)
+        try:
+            joblib.dump(model, tmp_path)
+            version = file_version(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self.path = path
+            self._model, self._stat, self._loaded = (model, version), file_stat(path), True
+        return version
+
+
+def encode_row(row):
+    """(indices blob, weights blob) of a one-row CSR matrix."""
+    return row.indices.astype(np.int32).tobytes(), row.data.astype(np.float32).tobytes()
+
+
+def decode_row(indices, weights):
+    return np.frombuffer(indices, dtype=np.int32), np.frombuffer(weights, dtype=np.float32)
+
+
+def rows_to_csr(rows, n_features):
+    """CSR matrix with one row per (indices blob, weights blob) pair."""
+    from scipy.sparse import csr_matrix
+    parts = [decode_row(indices, weights) for indices, weights in rows]
+    indptr = np.zeros(len(parts) + 1, dtype=np.int64)
+    np.cumsum([len(idx) for idx, _ in parts], out=indptr[1:])
+    indices = np.concatenate([idx for idx, _ in parts]) if parts else np.empty(0, dtype=np.int32)
+    weights = np.concatenate([w for _, w in parts]) if parts else np.empty(0, dtype=np.float32)
+    return csr_matrix((weights, indices, indptr), shape=(len(parts), n_features))
@@ -0,0 +1,176 @@
+"""
+Live ingestion of forum Answers into the AskAlum RAG index
+SQLAlchemy session events record answers that are added, edited or deleted;
+once the transaction commits they are queued for a background thread that
+embeds and indexes them, so posting an answer never waits on embedding.
+Changes are applied at most once per SNAPSHOT_INTERVAL, because each apply
+writes a full index snapshot.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import event
+
+from models import db, Answer
+
+# Seconds the worker waits for more changes before indexing a batch
+BATCH_WAIT = float(os.getenv("ASK_ALUM_INDEX_BATCH_WAIT", "0.5"))
+BATCH_MAX = int(os.getenv("ASK_ALUM_INDEX_BATCH_MAX", "64"))
+# Every indexing pass saves a snapshot: the whole FAISS index plus
+# documents.json, i.e. O(index size) of disk writes however few answers
+# changed, and every other worker then reloads it. Changes are therefore
+# held until SNAPSHOT_INTERVAL seconds have passed since the last snapshot
+# or SNAPSHOT_CHANGES are pending; keep the interval near RAG_RELOAD_INTERVAL,
+# the cadence at which other workers pick snapshots up.
+SNAPSHOT_INTERVAL = float(os.getenv("ASK_ALUM_SNAPSHOT_INTERVAL", "5"))
+SNAPSHOT_CHANGES = int(os.getenv("ASK_ALUM_SNAPSHOT_CHANGES", "256"))
+
+_PENDING_KEY = 'ask_alum_answer_ops'
+# Queued by wait_until_indexed to apply held changes right away
+_FLUSH = ('flush', None)
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+_app = None
+
+
+def answer_doc_id(answer_id):
+    return f"answer_{answer_id}"
+
+
+def answer_document(answer):
+    """(doc_id, text, meta) tuple for an Answer row."""
+    meta = {'question_id': answer.question_id, 'user_id': answer.user_id}
+    return answer_doc_id(answer.id), answer.content or '', meta
+
+
+def _record(session, op, doc):
+    session.info.setdefault(_PENDING_KEY, []).append((op, doc))
+
+
+def _after_flush(session, flush_context):
+    # Attribute history is still available here, and ids have been assigned
+    for obj in session.new:
+        if isinstance(obj, Answer):
+            _record(session, 'upsert', answer_document(obj))
+    for obj in session.dirty:
+        if isinstance(obj, Answer) and db.inspect(obj).attrs.content.history.has_changes():
+            _record(session, 'upsert', answer_document(obj))
+    for obj in session.deleted:
+        # Includes answers removed by cascade when a question or user is deleted
+        if isinstance(obj, Answer):
+            _record(session, 'delete', answer_doc_id(obj.id))
+
+
+def _after_commit(session):
+    ops = session.info.pop(_PENDING_KEY, None)
+    if ops:
+        _start_worker()
+        for op in ops:
+            _queue.put(op)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _coalesce(ops):
+    """Keep only the last operation per document, in first-seen order."""
+    latest = {}
+    for op, doc in ops:
+        doc_id = doc if op == 'delete' else doc[0]
+        latest.pop(doc_id, None)
+        latest[doc_id] = (op, doc)
+    return list(latest.values())
+
+
+def _drain(timeout=None):
+    """
+    Wait up to timeout seconds (None: forever) for one change, then collect
+    whatever else arrives shortly after; [] if nothing arrived.
+    """
+    try:
+        ops = [_queue.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while len(ops) < BATCH_MAX and ops[-1] != _FLUSH:
+        try:
+            ops.append(_queue.get(timeout=BATCH_WAIT))
+        except queue.Empty:
+            break
+    return ops
+
+
+def _apply(ops):
+    from extensions.ai.rag_faiss import add_documents, delete_document, index_transaction
+    ops = _coalesce(ops)
+    upserts = [doc for op, doc in ops if op == 'upsert']
+    deletes = [doc_id for op, doc_id in ops if op == 'delete']
+    with index_transaction():
+        for doc_id in deletes:
+            delete_document(doc_id)
+        if upserts:
+            add_documents(upserts)
+    _app.logger.info(f"Indexed {len(upserts)} answers, removed {len(deletes)}")
+
+
+def _run():
+    held = []
+    last_snapshot = float('-inf')
+    while True:
+        wait = max(0.0, last_snapshot + SNAPSHOT_INTERVAL - time.monotonic()) if held else None
+        held += _drain(wait)
+        flush = _FLUSH in held
+        if not held or not (flush or len(held) >= SNAPSHOT_CHANGES
+                            or time.monotonic() - last_snapshot >= SNAPSHOT_INTERVAL):
+            continue
+        ops = [op for op in held if op != _FLUSH]
+        try:
+            if ops:
+                with _app.app_context():
+                    _apply(ops)
+                last_snapshot = time.monotonic()
+        except Exception as e:
+            _app.logger.error(f"Answer indexing failed for {len(ops)} changes: {e}")
+        finally:
+            for _ in held:
+                _queue.task_done()
+            held = []
+
+
+def _start_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='ask-alum-indexer', daemon=True)
+            _worker.start()
+
+
+def wait_until_indexed():
+    """Apply every queued change now and block until it is done (for scripts and tests)."""
+    _start_worker()
+    _queue.put(_FLUSH)
+    _queue.join()
+
+
+def _flush_at_exit():
+    # Held changes would otherwise be lost with the daemon thread
+    if _worker is not None and _worker.is_alive():
+        wait_until_indexed()
+
+
+def init_app(app):
+    """Feed committed Answer changes to the RAG index in the background."""
+    global _app
+    if _app is not None:
+        return
+    _app = app
+    atexit.register(_flush_at_exit)
+    event.listen(db.session, 'after_flush', _after_flush)
+    event.listen(db.session, 'after_commit', _after_commit)
+    event.listen(db.session, 'after_rollback', _after_rollback)
+    event.listen(db.session, 'after_soft_rollback', lambda session, previous: _after_rollback(session))
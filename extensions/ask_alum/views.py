@@ -1,5 +1,7 @@
 # extensions/ask_alum/views.py
-from flask import render_template, request, current_app, jsonify
+import json
+from flask import render_template, request, current_app, jsonify, Response, stream_with_context
+from extensions.ai.bm25 import BM25Index
 from . import ask_bp
 
 # Safe demo set; in production query DB table of verified alumni advice
@@ -9,6 +11,11 @@ SAMPLE_ADVICE = [
     {'id':3, 'author':'Alumnus C', 'content':'Network with alumni during events.'}
 ]
 
+# Keyword index over SAMPLE_ADVICE; positions line up with the list
+_advice_index = BM25Index()
+for _advice in SAMPLE_ADVICE:
+    _advice_index.add(f"{_advice['author']} {_advice['content']}")
+
 @ask_bp.route('/', methods=['GET','POST'])
 def ask():
     if not current_app.config['FEATURE_FLAGS'].get('ASK_ALUM', False):
@@ -18,8 +25,7 @@ def ask():
     if request.method == 'POST':
         query = request.form.get('query','').strip()
         if query:
-            q = query.lower()
-            results = [r for r in SAMPLE_ADVICE if q in r['content'].lower() or q in r['author'].lower()]
+            results = [SAMPLE_ADVICE[pos] for pos, _ in _advice_index.search(query, k=10)]
     return render_template('ask/form.html', results=results, query=query)
 
 @ask_bp.route('/rag', methods=['POST'])
@@ -54,3 +60,48 @@ def ask_rag():
     except Exception as e:
         current_app.logger.exception("RAG query failed")
         return jsonify({"error": "Internal server error"}), 500
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@ask_bp.route('/rag/stream', methods=['POST'])
+def ask_rag_stream():
+    """
+    Streaming RAG endpoint (server-sent events). Emits a `sources` event as
+    soon as retrieval finishes, `token` events as the answer is generated,
+    then `done`. /ask/rag keeps the blocking JSON contract.
+    """
+    if not current_app.config['FEATURE_FLAGS'].get('ASK_ALUM', False):
+        return jsonify({"error": "Feature disabled"}), 404
+
+    data = request.get_json(silent=True)
+    query = (data or {}).get('query', '').strip()
+    if not query:
+        return jsonify({"error": "Query is required"}), 400
+
+    try:
+        from extensions.ai.rag_faiss import stream_rag
+    except ImportError as e:
+        current_app.logger.error(f"RAG module not available: {e}")
+        return jsonify({"error": "RAG feature not available"}), 503
+
+    def generate():
+        # Flush headers right away so the client sees the first byte immediately
+        yield ": stream open\n\n"
+        try:
+            for event, payload in stream_rag(query, k=3):
+                if event == 'sources':
+                    yield _sse('sources', {"query": query, "sources": payload})
+                else:
+                    yield _sse('token', {"text": payload})
+            yield _sse('done', {})
+        except Exception:
+            current_app.logger.exception("RAG stream failed")
+            yield _sse('error', {"error": "Internal server error"})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -0,0 +1,125 @@
+"""
+Batch materialization of mentor recommendations
+Run nightly (scripts/materialize_recommendations.py): scores every student
+against every mentor with blocked sparse matrix products, so memory stays at
+one block of students x all mentors, and writes the top N per student to the
+mentor_recommendation table under a new RecommendationRun. db_mcs serves
+these rows with one indexed lookup and scores live only students whose
+profile changed (or who were created) after the run.
+"""
+import hashlib
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+
+from models import db, User, MentorRecommendation, RecommendationRun
+from extensions.ai.ranking import top_k
+from .mentor_vectors import ensure_matrix, get_model, profile_text
+
+STUDENT_ROLE = 'student'
+TOP_N = 10
+# Students per block; a block's similarities are a dense BLOCK_SIZE x mentors
+# float32 array (512 x 20k mentors is 40 MB)
+BLOCK_SIZE = 512
+
+
+def profile_hash(user):
+    """Fingerprint of the profile text recommendations were computed from."""
+    return hashlib.sha1(profile_text(user).encode('utf-8')).hexdigest()[:16]
+
+
+def block_top_n(student_block, mentor_matrix_t, n):
+    """
+    Top n mentor columns per student row: (indices, similarities), both
+    (rows x n) and best first. mentor_matrix_t is the mentor matrix transposed.
+    """
+    sims = (student_block @ mentor_matrix_t).toarray()
+    idx = top_k(sims, n)
+    return idx, np.take_along_axis(sims, idx, axis=1)
+
+
+def _student_blocks(block_size):
+    """Yield lists of students, block_size at a time, by ascending id."""
+    last_id = 0
+    while True:
+        students = User.query.filter(User.role == STUDENT_ROLE, User.id > last_id) \
+            .order_by(User.id).limit(block_size).all()
+        if not students:
+            return
+        yield students
+        last_id = students[-1].id
+
+
+def materialize(top_n=TOP_N, block_size=BLOCK_SIZE):
+    """Compute and store the top_n mentors of every student. Returns the finished run."""
+    vect, matrix, ids = ensure_matrix()
+    run = RecommendationRun(top_n=top_n, model_version=get_model()[1])
+    db.session.add(run)
+    db.session.commit()
+    run_id = run.id
+
+    started = time.perf_counter()
+    students_done = rows_written = 0
+    mentor_t = matrix.T.tocsr() if matrix is not None and matrix.shape[0] else None
+    table = MentorRecommendation.__table__
+    for students in _student_blocks(block_size):
+        texts = [profile_text(s) for s in students]
+        rows = []
+        if mentor_t is not None:
+            queries = vect.transform(texts).tocsr()
+            idx, sims = block_top_n(queries, mentor_t, top_n)
+            for i, student in enumerate(students):
+                # Like live scoring, a profile with no term in the model's
+                # vocabulary gets no recommendations (its similarities are all 0)
+                if not queries.indptr[i + 1] - queries.indptr[i]:
+                    continue
+                digest = profile_hash(student)
+                for rank, (col, sim) in enumerate(zip(idx[i], sims[i]), 1):
+                    rows.append({'run_id': run_id, 'student_id': student.id, 'rank': rank,
+                                 'mentor_id': int(ids[col]), 'skill_match': float(sim),
+                                 'profile_hash': digest})
+        if rows:
+            db.session.execute(table.insert(), rows)
+        # The identity map is weak-referencing, so finished blocks are freed
+        db.session.commit()
+        students_done += len(students)
+        rows_written += len(rows)
+
+    run = RecommendationRun.query.get(run_id)
+    run.students = students_done
+    run.finished_at = datetime.utcnow()
+    db.session.commit()
+    # Older runs are no longer served
+    old_runs = [r.id for r in RecommendationRun.query.filter(RecommendationRun.id < run_id)]
+    if old_runs:
+        MentorRecommendation.query.filter(MentorRecommendation.run_id.in_(old_runs)) \
+            .delete(synchronize_session=False)
+        RecommendationRun.query.filter(RecommendationRun.id.in_(old_runs)).delete(synchronize_session=False)
+        db.session.commit()
+    current_app.logger.info(f"Materialized {rows_written} recommendations for {students_done} students "
+                            f"in {time.perf_counter() - started:.1f}s")
+    return run
+
+
+def latest_run():
+    return RecommendationRun.query.filter(RecommendationRun.finished_at.isnot(None)) \
+        .order_by(RecommendationRun.finished_at.desc()).first()
+
+
+def stored_recommendations(student, limit):
+    """
+    [(mentor_id, skill similarity)] from the latest run, best first, or None
+    when the student has to be scored live: no finished run, the run keeps
+    fewer than limit mentors, or the student's profile was created or changed
+    since the run.
+    """
+    run = latest_run()
+    if run is None or limit > run.top_n:
+        return None
+    rows = MentorRecommendation.query.filter_by(run_id=run.id, student_id=student.id) \
+        .order_by(MentorRecommendation.rank).all()
+    if not rows or rows[0].profile_hash != profile_hash(student):
+        return None
+    return [(row.mentor_id, row.skill_match) for row in rows]
@@ -1,21 +1,54 @@
 """
 Database-backed Mentor Compatibility Scoring (MCS)
-Matches students to mentors using TF-IDF skill similarity and logistical factors
+Matches students to mentors using TF-IDF skill similarity and logistical factors.
+Every eligible mentor's profile is a stored row of one L2-normalized sparse
+TF-IDF matrix (see mentor_vectors.py), so a recommendation is the student's
+transform, one sparse matrix-vector product and an argpartition top-k over
+the whole corpus. Students whose profile is unchanged since the nightly
+batch run (batch.py) are served its stored results instead.
 """
+import numpy as np
 from flask import current_app
+
 from models import User
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from extensions.ai.ranking import top_k
+from .batch import stored_recommendations
+from .mentor_vectors import MENTOR_ROLES, ensure_matrix, profile_text
+
+SKILL_WEIGHT = 0.7
+LOGISTICAL_WEIGHT = 0.3
+# Logistical feasibility (simplified: no timezone/availability data yet)
+LOGISTICAL_DEFAULT = 0.5
+
+
+def rank_mentors(vect, matrix, ids, student_text, k, exclude_id=None):
+    """
+    [(row, skill similarity)] of the k best mentors for student_text, best
+    first; exclude_id (the student) is never recommended.
+    """
+    if matrix is None:
+        return []
+    query = vect.transform([student_text])
+    if not query.nnz:
+        return []
+    # Sparse matrix times dense vector; sparse @ sparse is over 10x slower
+    sims = matrix @ query.toarray().ravel()
+    if exclude_id is not None:
+        row = np.searchsorted(ids, exclude_id)
+        if row < len(ids) and ids[row] == exclude_id:
+            sims[row] = -np.inf
+    # Combined score is monotonic in similarity, so rank on similarity alone
+    return [(int(i), float(sims[i])) for i in top_k(sims, k) if np.isfinite(sims[i])]
+
 
 def get_recommendations_for_student(student_id, num_recommendations=3):
     """
     Get mentor recommendations for a student using database data.
-    
+
     Args:
         student_id: ID of the student
         num_recommendations: How many mentors to return
-    
+
     Returns:
         List of dicts with mentor info and compatibility score
     """
@@ -24,68 +57,35 @@ def get_recommendations_for_student(student_id, num_recommendations=3):
         student = User.query.get(student_id)
         if not student:
             return []
-        
-        # Get student's skills (assume stored in a skills field or profile text)
-        student_skills = getattr(student, 'skills', '') or student.bio or ''
+
+        student_skills = profile_text(student)
         if not student_skills:
             return []
-        
-        # Get all mentors (assuming a role field or mentor flag)
-        mentors = User.query.filter(
-            (User.id != student_id) &
-            (User.role == 'mentor' if hasattr(User, 'role') else True)
-        ).limit(20).all()
-        
-        if not mentors:
-            return []
-        
-        # Extract mentor skills
-        mentor_skills = [
-            (m.id, getattr(m, 'username', '') or str(m.id), getattr(m, 'skills', '') or getattr(m, 'bio', '') or '')
-            for m in mentors
-        ]
-        
-        # TF-IDF matching
-        all_texts = [student_skills] + [skills for _, _, skills in mentor_skills]
-        try:
-            vect = TfidfVectorizer(stop_words='english', max_features=50)
-            mat = vect.fit_transform(all_texts).toarray()
-        except ValueError:
-            # Corpus too small, return empty
-            return []
-        
-        # Calculate cosine similarity
-        student_vec = mat[0]
-        scores = []
-        for i, (mentor_id, mentor_name, _) in enumerate(mentor_skills, 1):
-            mentor_vec = mat[i]
-            sim = float(
-                np.dot(student_vec, mentor_vec) / 
-                ((np.linalg.norm(student_vec) * np.linalg.norm(mentor_vec)) + 1e-9)
-            )
-            
-            # Logistical feasibility (simplified: prefer available mentors)
-            logistical = 0.5
-            
-            # Combined score
-            combined = 0.7 * sim + 0.3 * logistical
-            scores.append((mentor_id, mentor_name, combined, sim))
-        
-        # Sort by score and return top N
-        scores.sort(key=lambda x: x[2], reverse=True)
+
+        # Materialized by the nightly batch run, unless the profile changed since
+        candidates = stored_recommendations(student, num_recommendations)
+        if candidates is None:
+            vect, matrix, ids = ensure_matrix()
+            # A few extra candidates in case a mentor was deleted since the last sync
+            ranked = rank_mentors(vect, matrix, ids, student_skills, num_recommendations + 5,
+                                  exclude_id=student.id)
+            candidates = [(int(ids[row]), sim) for row, sim in ranked]
+        names = dict(User.query.with_entities(User.id, User.username).filter(
+            User.id.in_([mentor_id for mentor_id, _ in candidates]), User.role.in_(MENTOR_ROLES)))
+        ranked = [(mentor_id, sim) for mentor_id, sim in candidates if mentor_id in names][:num_recommendations]
         recommendations = [
             {
-                "mentor_id": m_id,
-                "mentor_name": m_name,
-                "compatibility_score": round(100 * score, 1),
-                "skill_match": round(100 * skill_sim, 1)
+                "mentor_id": mentor_id,
+                "mentor_name": names[mentor_id] or str(mentor_id),
+                "compatibility_score": round(100 * (SKILL_WEIGHT * sim + LOGISTICAL_WEIGHT * LOGISTICAL_DEFAULT), 1),
+                "skill_match": round(100 * sim, 1)
             }
-            for m_id, m_name, score, skill_sim in scores[:num_recommendations]
+            for mentor_id, sim in ranked
         ]
-        
+
         current_app.logger.info(f"Generated {len(recommendations)} recommendations for student {student_id}")
         return recommendations
-        
+
     except Exception as e:
         current_app.logger.exception(f"Error generating mentor recommendations: {e}")
         return []
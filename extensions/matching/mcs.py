@@ -1,13 +1,15 @@
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 def compute_content_similarity(student_vec, mentor_vec):
     try:
         student_vec = np.array(student_vec, dtype=float)
         mentor_vec = np.array(mentor_vec, dtype=float)
-        if np.linalg.norm(student_vec) == 0 or np.linalg.norm(mentor_vec) == 0:
+        student_norm = np.linalg.norm(student_vec)
+        mentor_norm = np.linalg.norm(mentor_vec)
+        if student_norm == 0 or mentor_norm == 0:
             return 0.0
-        return float(cosine_similarity([student_vec], [mentor_vec])[0][0])
+        # Plain numpy: importing sklearn for one dot product costs ~1s at startup
+        return float(np.dot(student_vec, mentor_vec) / (student_norm * mentor_norm))
     except Exception:
         return 0.0
 
@@ -31,3 +33,82 @@ def mentor_compatibility_score(student_vec, mentor_vec, student_tz, mentor_tz, s
     lf = compute_logistical_feasibility(student_tz, mentor_tz, student_avail, mentor_avail)
     cf = compute_collaborative_filtering(cf_history)
     return round(alpha * cs + beta * lf + gamma * cf, 4)
+
+# Batch scoring: the same score for N mentors in one vectorized pass.
+# Availability slots (e.g. hours 0-23) are packed into int64 bitmasks, so only
+# slots 0-63 are supported.
+MAX_SLOT = 63
+
+# popcount per byte, for numpy < 2.0 which has no np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def avail_bitmask(slots):
+    mask = 0
+    for slot in set(slots):
+        if not 0 <= slot <= MAX_SLOT:
+            raise ValueError(f"Availability slot {slot} outside 0-{MAX_SLOT}")
+        mask |= 1 << int(slot)
+    # Stored as int64; slot 63 maps to the sign bit
+    return np.int64(np.uint64(mask).view(np.int64))
+
+
+def avail_bitmasks(slot_lists):
+    return np.array([avail_bitmask(slots) for slots in slot_lists], dtype=np.int64)
+
+
+def cf_scores(histories):
+    """compute_collaborative_filtering for each mentor's history."""
+    return np.array([compute_collaborative_filtering(h) for h in histories], dtype=float)
+
+
+def _popcount(masks):
+    if hasattr(np, 'bitwise_count'):
+        # Unsigned view: on signed ints bitwise_count counts the absolute value
+        return np.bitwise_count(np.ascontiguousarray(masks, dtype=np.int64).view(np.uint64)).astype(np.int64)
+    as_bytes = np.ascontiguousarray(masks, dtype=np.int64).view(np.uint8).reshape(-1, 8)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1)
+
+
+def score_mentors(student, mentor_matrix, tz_array, avail_bitmasks, cf_array, alpha=0.4, beta=0.4, gamma=0.2):
+    """
+    mentor_compatibility_score for N mentors at once.
+
+    student is (vec, tz, avail slots or bitmask); mentor_matrix is (N x D),
+    dense or scipy sparse; tz_array, avail_bitmasks (see avail_bitmasks())
+    and cf_array (see cf_scores()) have one entry per mentor. Returns the N
+    rounded scores, equal to calling the scalar function per mentor.
+    """
+    student_vec, student_tz, student_avail = student
+    student_vec = np.asarray(student_vec, dtype=float).ravel()
+    if not isinstance(student_avail, (int, np.integer)):
+        student_avail = avail_bitmask(student_avail)
+
+    # Content similarity; 0 where either vector is all zeros
+    if hasattr(mentor_matrix, 'multiply'):
+        dots = np.asarray(mentor_matrix @ student_vec, dtype=float).ravel()
+        mentor_norms = np.sqrt(np.asarray(mentor_matrix.multiply(mentor_matrix).sum(axis=1), dtype=float).ravel())
+    else:
+        mentor_matrix = np.asarray(mentor_matrix, dtype=float)
+        dots = mentor_matrix @ student_vec
+        mentor_norms = np.linalg.norm(mentor_matrix, axis=1)
+    student_norm = np.linalg.norm(student_vec)
+    denom = student_norm * mentor_norms
+    cs = np.zeros(len(dots))
+    np.divide(dots, denom, out=cs, where=(mentor_norms != 0) & (student_norm != 0))
+
+    # Logistical feasibility
+    tz_array = np.asarray(tz_array, dtype=float)
+    tz_score = np.where(tz_array == student_tz, 1.0, np.maximum(0, 1 - np.abs(student_tz - tz_array) / 24))
+    masks = np.asarray(avail_bitmasks, dtype=np.int64)
+    overlap = _popcount(masks & np.int64(student_avail))
+    total = np.maximum(1, _popcount(masks | np.int64(student_avail)))
+    lf = 0.6 * tz_score + 0.4 * (overlap / total)
+
+    combined = alpha * cs + beta * lf + gamma * np.asarray(cf_array, dtype=float)
+    scores = np.round(combined, 4)
+    # np.round can disagree with round() only next to a half-way point; redo those
+    scaled = combined * 1e4
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        scores[i] = round(float(combined[i]), 4)
+    return scores
@@ -0,0 +1,228 @@
+"""
+Persisted mentor profile vectors
+The mentor TF-IDF model is fitted once on every mentor profile and saved with
+joblib; each mentor's L2-normalized row is stored in a MentorVector row. When
+update_profile or the admin update_user action edits a user, only that row is
+recomputed. Each process keeps the rows as one CSR matrix (ordered by user id)
+and, per request, pulls in just the rows updated since it last synced, so a
+recommendation costs the student transform and one matrix product. A process
+reloads the model when another one refits it (see extensions/ai/tfidf_store.py).
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from models import db, User, MentorVector
+from extensions.ai.tfidf_store import PersistedModel, encode_row, rows_to_csr
+
+MODEL_PATH = os.getenv("MCS_TFIDF_PATH", os.path.join("instance", "mentor_tfidf.joblib"))
+MENTOR_ROLES = ('alumni', 'mentor')
+MAX_FEATURES = int(os.getenv("MCS_TFIDF_MAX_FEATURES", "50000"))
+BATCH = 1000
+# Seconds between full consistency checks: mentors without a stored vector
+# (added outside the app's routes) and deleted rows, which a per-request
+# check could only find by scanning. Until then db_mcs skips deleted users.
+RECONCILE_INTERVAL = float(os.getenv("MCS_RECONCILE_SECONDS", "60"))
+
+_model = PersistedModel(MODEL_PATH)
+
+# (model version, newest updated_at applied, CSR matrix, User.id per row)
+_state = (None, None, None, np.empty(0, dtype=np.int64))
+_sync_lock = threading.Lock()
+_reconciled_at = None
+
+
+def profile_text(user):
+    """Skills text of a user (assume stored in a skills field or profile text)."""
+    return getattr(user, 'skills', '') or getattr(user, 'bio', '') or getattr(user, 'course', '') or ''
+
+
+def is_mentor(user):
+    return user.role in MENTOR_ROLES
+
+
+def make_vectorizer():
+    # Imported here so the app starts without loading scikit-learn
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words='english', sublinear_tf=True, max_features=MAX_FEATURES,
+                           dtype=np.float32)
+
+
+def build_mentor_matrix(texts):
+    """(vectorizer, CSR matrix) fitted on texts; (None, None) if no text has terms."""
+    vect = make_vectorizer()
+    try:
+        matrix = vect.fit_transform(texts).tocsr()
+    except ValueError:
+        # Empty vocabulary: no mentor has any profile text
+        return None, None
+    return vect, matrix
+
+
+def get_model():
+    """
+    (vectorizer, version) loaded from MODEL_PATH on first use and reloaded
+    when the file changes; (None, None) if not fitted. The version is a
+    content hash of the model file.
+    """
+    return _model.get()
+
+
+def fit_model(texts):
+    """Fit the mentor model on texts and save it (atomically) to MODEL_PATH."""
+    vect, _ = build_mentor_matrix(texts)
+    if vect is None:
+        return None
+    _model.save(vect)
+    return vect
+
+
+def vectorize_users(users, model=None):
+    """
+    Recompute the stored vectors of edited users under model (default the
+    current one); the caller commits. Users who are no longer mentors lose
+    theirs. A no-op until the model is fitted.
+    """
+    vect, version = model or get_model()
+    if vect is None:
+        return
+    mentors = [user for user in users if is_mentor(user)]
+    for user in users:
+        if not is_mentor(user):
+            user.mentor_vector = None
+    if not mentors:
+        return
+    matrix = vect.transform([profile_text(user) for user in mentors]).tocsr()
+    now = datetime.utcnow()
+    for i, user in enumerate(mentors):
+        record = user.mentor_vector or MentorVector()
+        record.indices, record.weights = encode_row(matrix[i])
+        record.model_version = version
+        record.updated_at = now
+        user.mentor_vector = record
+
+
+def _vectorize_all(query, model):
+    """Vectorize the users of query in batches, committing each; returns the count."""
+    done = 0
+    while True:
+        # Vectorized users drop out of the query, so always take the first batch
+        users = query.options(joinedload(User.mentor_vector)).order_by(User.id).limit(BATCH).all()
+        if not users:
+            return done
+        vectorize_users(users, model)
+        db.session.commit()
+        done += len(users)
+
+
+def rebuild():
+    """
+    Refit the mentor model on every mentor profile and re-vectorize them all.
+    Returns how many rows were re-vectorized (0 when the refit reproduced the
+    same model), or None when no profile has text to fit on.
+    """
+    mentors = User.query.filter(User.role.in_(MENTOR_ROLES)).all()
+    if fit_model([profile_text(user) for user in mentors]) is None:
+        return None
+    model = get_model()
+    MentorVector.query.filter(MentorVector.model_version != model[1]).delete(synchronize_session=False)
+    db.session.commit()
+    done = _vectorize_all(User.query.outerjoin(MentorVector)
+                          .filter(User.role.in_(MENTOR_ROLES), MentorVector.user_id.is_(None)), model)
+    current_app.logger.info(f"Rebuilt mentor vectors for {done} mentors")
+    return done
+
+
+def _reconcile(model):
+    """Add rows for mentors that have none (e.g. new signups) and drop rows of non-mentors."""
+    global _reconciled_at
+    version = model[1]
+    _reconciled_at = time.monotonic()
+    mentors = db.session.query(func.count(User.id)).filter(User.role.in_(MENTOR_ROLES)).scalar()
+    if mentors == _row_signature(version)[0]:
+        return
+    non_mentors = select(User.id).where(~User.role.in_(MENTOR_ROLES))
+    MentorVector.query.filter(MentorVector.user_id.in_(non_mentors)).delete(synchronize_session=False)
+    db.session.commit()
+    done = _vectorize_all(User.query.outerjoin(MentorVector).filter(
+        User.role.in_(MENTOR_ROLES),
+        (MentorVector.user_id.is_(None)) | (MentorVector.model_version != version)), model)
+    if done:
+        current_app.logger.info(f"Vectorized {done} mentors without a stored vector")
+
+
+def _row_signature(version):
+    """(row count, newest updated_at) of the current model's rows."""
+    return db.session.query(func.count(MentorVector.user_id), func.max(MentorVector.updated_at)) \
+        .filter(MentorVector.model_version == version).one()
+
+
+def _last_update(version):
+    # One index probe; counting rows would scan the whole index
+    return db.session.query(func.max(MentorVector.updated_at)) \
+        .filter(MentorVector.model_version == version).scalar()
+
+
+def _load_rows(version, vect, since=None):
+    query = db.session.query(MentorVector.user_id, MentorVector.indices, MentorVector.weights) \
+        .filter(MentorVector.model_version == version)
+    if since is not None:
+        query = query.filter(MentorVector.updated_at >= since)
+    rows = query.order_by(MentorVector.user_id).all()
+    return rows_to_csr([row[1:] for row in rows], len(vect.vocabulary_)), \
+        np.array([row[0] for row in rows], dtype=np.int64)
+
+
+def _merge(matrix, ids, changed, changed_ids):
+    """Replace or append the changed rows, keeping rows ordered by user id."""
+    from scipy.sparse import vstack
+    keep = ~np.isin(ids, changed_ids)
+    matrix = vstack([matrix[keep], changed], format='csr')
+    ids = np.concatenate([ids[keep], changed_ids])
+    order = np.argsort(ids, kind='stable')
+    return matrix[order], ids[order]
+
+
+def ensure_matrix():
+    """
+    (vectorizer, CSR matrix, User.id per row) in step with the MentorVector
+    table. Fits the model on first use; the matrix is None with no mentors.
+    """
+    global _state
+    vect, version = get_model()
+    if vect is None:
+        rebuild()
+        vect, version = get_model()
+        if vect is None:
+            return None, None, np.empty(0, dtype=np.int64)
+
+    if _reconciled_at is None or time.monotonic() - _reconciled_at > RECONCILE_INTERVAL:
+        _reconcile((vect, version))
+        rows, last = _row_signature(version)
+    else:
+        rows, last = None, _last_update(version)
+
+    state_version, synced, matrix, ids = _state
+    if state_version == version and rows in (None, len(ids)) and \
+            (last is None or (synced is not None and last <= synced)):
+        return vect, matrix, ids
+    with _sync_lock:
+        state_version, synced, matrix, ids = _state
+        if state_version != version or matrix is None or synced is None:
+            matrix, ids = _load_rows(version, vect)
+        elif last is not None and last > synced:
+            # Rows stamped with the last sync time are re-read in case a
+            # concurrent writer used the same timestamp
+            changed, changed_ids = _load_rows(version, vect, since=synced)
+            matrix, ids = _merge(matrix, ids, changed, changed_ids)
+        if rows is not None and len(ids) != rows:
+            # Rows were deleted (user deleted or no longer a mentor): reload
+            matrix, ids = _load_rows(version, vect)
+        _state = (version, last, matrix, ids)
+    return vect, matrix, ids
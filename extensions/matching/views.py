@@ -1,7 +1,8 @@
 # extensions/matching/views.py
 from flask import render_template, current_app, session
+from flask_login import current_user
 from . import mcs_bp
-from .mcs import mentor_compatibility_score
+from .mcs import avail_bitmasks, cf_scores, score_mentors
 
 @mcs_bp.route('/recommend', methods=['GET'])
 def recommend():
@@ -9,7 +10,7 @@ def recommend():
         return "Feature disabled", 404
     
     # Get student ID from session (or request parameter for testing)
-    student_id = session.get('user_id')
+    student_id = session.get('user_id') or (current_user.id if current_user.is_authenticated else None)
     
     if not student_id:
         # Demo/fallback: use demo data
@@ -23,10 +24,14 @@ def recommend():
             {'id': 11, 'name': 'A. Mentor', 'vec': [0.1,0.19,0.31], 'tz': 5.5, 'avail': list(range(10,17)),'history': [0.8,0.9]},
             {'id': 12, 'name': 'B. Mentor', 'vec': [0.0,0.2,0.4], 'tz': 2.0, 'avail': list(range(20,23)),'history': [0.6,0.7]},
         ]
-        recommendations = []
-        for m in mentors:
-            score = mentor_compatibility_score(student['vec'], m['vec'], student['tz'], m['tz'], student['avail'], m['avail'], m.get('history', []))
-            recommendations.append({'mentor': m, 'score': score})
+        scores = score_mentors(
+            (student['vec'], student['tz'], student['avail']),
+            [m['vec'] for m in mentors],
+            [m['tz'] for m in mentors],
+            avail_bitmasks([m['avail'] for m in mentors]),
+            cf_scores([m.get('history', []) for m in mentors]),
+        )
+        recommendations = [{'mentor': m, 'score': float(score)} for m, score in zip(mentors, scores)]
         recommendations = sorted(recommendations, key=lambda r: r['score'], reverse=True)
     else:
         # Use real database-backed recommendations
@@ -0,0 +1,168 @@
+"""
+Bulk resume screening
+Unpacks a ZIP or a multi-file upload, extracts text in parallel sandboxed
+child processes (PDF parsing is CPU-bound and holds the GIL; see
+extensions/ai/extraction.py), then scores every resume against one job in a
+single sparse matrix-vector product. Resumes already in the extraction cache
+are not parsed again.
+"""
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from werkzeug.utils import secure_filename
+
+from extensions.ai import extraction
+from extensions.ai.ats_model import get_vectorizer, make_vectorizer
+from extensions.ai.skills import get_skill_matcher
+from .store import cache_extraction, file_digest, get_extraction_cache
+
+MAX_FILES = int(os.getenv("BULK_MAX_FILES", "500"))
+# Cap on the uncompressed size of a ZIP, to refuse zip bombs before unpacking
+MAX_ZIP_BYTES = int(os.getenv("BULK_MAX_ZIP_BYTES", str(200 * 1024 * 1024)))
+
+
+class BulkUploadError(ValueError):
+    """The upload cannot be screened (bad archive, too many files...)."""
+
+
+def _unique_path(dest_dir, name, seen):
+    base = secure_filename(os.path.basename(name)) or 'resume'
+    candidate, n = base, 1
+    while candidate in seen:
+        stem, dot, ext = base.rpartition('.')
+        candidate = f"{stem}_{n}.{ext}" if dot else f"{base}_{n}"
+        n += 1
+    seen.add(candidate)
+    return candidate, os.path.join(dest_dir, candidate)
+
+
+def _unpack_zip(stream, dest_dir, allowed_file, seen, saved):
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile as e:
+        raise BulkUploadError(f"Not a valid ZIP archive: {e}") from e
+    with archive:
+        members = [m for m in archive.infolist() if not m.is_dir() and allowed_file(m.filename)
+                   and not os.path.basename(m.filename).startswith('.')]
+        if len(saved) + len(members) > MAX_FILES:
+            raise BulkUploadError(f"At most {MAX_FILES} resumes per upload")
+        if sum(m.file_size for m in members) > MAX_ZIP_BYTES:
+            raise BulkUploadError(f"ZIP expands to more than {MAX_ZIP_BYTES} bytes")
+        for member in members:
+            name, path = _unique_path(dest_dir, member.filename, seen)
+            with archive.open(member) as src, open(path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            saved.append((name, path))
+
+
+def save_uploads(files, dest_dir, allowed_file):
+    """
+    Save uploaded resumes (and the contents of any ZIPs among them) into
+    dest_dir. Returns [(filename, path)] in upload order.
+    """
+    saved, seen = [], set()
+    for f in files:
+        if not f or not f.filename:
+            continue
+        if f.filename.lower().endswith('.zip'):
+            _unpack_zip(f.stream, dest_dir, allowed_file, seen, saved)
+        elif allowed_file(f.filename):
+            if len(saved) >= MAX_FILES:
+                raise BulkUploadError(f"At most {MAX_FILES} resumes per upload")
+            name, path = _unique_path(dest_dir, f.filename, seen)
+            f.save(path)
+            saved.append((name, path))
+    return saved
+
+
+def _extract_one(path):
+    """(Extraction or None, error message) for one file."""
+    try:
+        return extraction.extract_sandboxed(path), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+def extract_all(paths):
+    """
+    Extract the text of every file in parallel; returns [(Extraction or None,
+    error)] in order. Each thread drives one sandboxed child process, and the
+    sandbox caps how many run at once.
+    """
+    if len(paths) <= 1:
+        return [_extract_one(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(len(paths), extraction.WORKERS)) as pool:
+        return list(pool.map(_extract_one, paths))
+
+
+def score_all(resume_texts, job_text, job_vec=None):
+    """
+    Cosine similarity (0-100) of every resume to job_text, in one pass.
+    job_vec is the job's stored dense vector under the fitted model, if known.
+    """
+    vect = get_vectorizer()
+    if vect is None:
+        vect, job_vec = make_vectorizer().fit(list(resume_texts) + [job_text]), None
+    resumes = vect.transform(resume_texts)
+    job = job_vec if job_vec is not None else vect.transform([job_text]).toarray().ravel()
+    return np.round(100 * (resumes @ job), 2)
+
+
+def _extract_cached(paths):
+    """
+    [(text, skills or None, partial_reason, error)] for paths, parsing only
+    the files whose digest is not in the extraction cache. New extractions
+    are cached.
+    """
+    cache = get_extraction_cache()
+    matcher = get_skill_matcher()
+    digests = [file_digest(path) for path in paths]
+    cached = cache.get_many(digests)
+    missing = [i for i, digest in enumerate(digests) if digest not in cached]
+    out = [None] * len(paths)
+    for i, (result, error) in zip(missing, extract_all([paths[i] for i in missing])):
+        if result is None:
+            out[i] = ("", None, None, error)
+            continue
+        cached_now = cache_extraction(cache, digests[i], result)
+        # Skills are only stored alongside cached text
+        skills = None if cached_now else matcher.extract(result.text)
+        out[i] = (result.text, skills, result.reason, None)
+    for i, digest in enumerate(digests):
+        if out[i] is None:
+            text, skills, version, partial_reason = cached[digest]
+            out[i] = (text, skills if version == matcher.version else None, partial_reason, None)
+    # Fill in skills that are not cached (or were cached for an older taxonomy)
+    for i, (text, skills, partial_reason, error) in enumerate(out):
+        if skills is None and error is None:
+            skills = matcher.extract(text)
+            cache.put_skills(digests[i], skills, matcher.version)
+            out[i] = (text, skills, partial_reason, error)
+    return out
+
+
+def screen(uploads, job_text, job_vec=None):
+    """
+    Rank saved uploads [(filename, path)] against job_text. Returns result
+    dicts sorted best first; files that could not be read come last.
+    """
+    extracted = _extract_cached([path for _, path in uploads])
+    texts = [text for text, _, _, _ in extracted]
+    scores = score_all(texts, job_text, job_vec) if texts else np.empty(0)
+    results = []
+    for (filename, _), (text, skills, partial_reason, error), score in zip(uploads, extracted, scores):
+        skills = sorted(skills or [])
+        results.append({
+            'filename': filename,
+            'score': float(score) if text.strip() else 0.0,
+            'skills': skills,
+            'partial': partial_reason,
+            'error': error,
+        })
+    results.sort(key=lambda r: (r['error'] is not None, -r['score']))
+    for rank, result in enumerate(results, 1):
+        result['rank'] = rank
+    return results
@@ -0,0 +1,214 @@
+"""
+Content-addressed resume store and extraction cache
+Uploads are saved under their SHA-256 (uploads/resumes/ab/abcd...ef.pdf), so
+identical files are stored once and different files with the same name never
+overwrite each other. Extracted text and skills are cached in SQLite by that
+hash, so rescoring a resume that was seen before skips parsing entirely.
+Skills are also keyed by the taxonomy version and recomputed when it changes.
+Text cut short by an extraction limit is cached with the reason, unless the
+limit was a transient one (timeout, crash) worth retrying next time.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+STORE_DIR = os.getenv("RESUME_STORE_DIR", os.path.join('uploads', 'resumes'))
+CACHE_PATH = os.getenv("RESUME_CACHE_PATH", os.path.join('instance', 'resume_cache.sqlite3'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    digest TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    skills TEXT,
+    skills_version TEXT,
+    partial_reason TEXT,
+    created_at REAL NOT NULL
+);
+"""
+
+_SQL_CHUNK = 500
+_HASH_BLOCK = 1 << 20
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+def stored_path(digest, ext, store_dir=None):
+    name = f"{digest}.{ext}" if ext else digest
+    return os.path.join(store_dir or STORE_DIR, digest[:2], name)
+
+
+def save_resume(f, store_dir=None):
+    """
+    Store an uploaded FileStorage by content hash. Returns (digest, path);
+    uploading the same bytes again returns the existing file.
+    """
+    store_dir = store_dir or STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    h = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(prefix='.upload-', dir=store_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for block in iter(lambda: f.stream.read(_HASH_BLOCK), b''):
+                h.update(block)
+                out.write(block)
+        digest = h.hexdigest()
+        path = stored_path(digest, _extension(f.filename), store_dir)
+        if os.path.exists(path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return digest, path
+
+
+class ExtractionCache:
+    """SQLite table of extracted text and skills keyed by file digest."""
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(extractions)")}
+            if 'partial_reason' not in columns:
+                conn.execute("ALTER TABLE extractions ADD COLUMN partial_reason TEXT")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, digests):
+        """
+        Return {digest: (text, skills or None, skills_version, partial_reason)}
+        for the digests that are cached.
+        """
+        digests = list(dict.fromkeys(digests))
+        found = {}
+        conn = self._connect()
+        for start in range(0, len(digests), _SQL_CHUNK):
+            chunk = digests[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT digest, text, skills, skills_version, partial_reason FROM extractions "
+                f"WHERE digest IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for digest, text, skills, version, partial_reason in rows:
+                found[digest] = (text, json.loads(skills) if skills else None, version, partial_reason)
+        self.hits += len(found)
+        self.misses += len(digests) - len(found)
+        return found
+
+    def get(self, digest):
+        return self.get_many([digest]).get(digest)
+
+    def put_text(self, digest, text, partial_reason=None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO extractions (digest, text, partial_reason, created_at) VALUES (?, ?, ?, ?)",
+                (digest, text, partial_reason, time.time()),
+            )
+
+    def put_skills(self, digest, skills, version):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE extractions SET skills = ?, skills_version = ? WHERE digest = ?",
+                (json.dumps(skills), version, digest),
+            )
+
+    def __len__(self):
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM extractions").fetchone()
+        return count
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extractions")
+        self.hits = self.misses = 0
+
+
+def get_extraction_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractionCache(CACHE_PATH)
+    return _cache
+
+
+def cache_extraction(cache, digest, extraction):
+    """Cache an Extraction unless it was cut short by a transient limit."""
+    from extensions.ai.extraction import TRANSIENT
+    if extraction.reason in TRANSIENT:
+        return False
+    cache.put_text(digest, extraction.text, extraction.reason)
+    return True
+
+
+def _extract(path, digest, cache):
+    from extensions.ai.ats import extract_document
+    extraction = extract_document(path)
+    cache_extraction(cache, digest, extraction)
+    return extraction
+
+
+def resume_text(path, digest=None):
+    """Text of the resume at path, parsed only if its digest is not cached."""
+    digest = digest or file_digest(path)
+    cache = get_extraction_cache()
+    cached = cache.get(digest)
+    if cached is not None:
+        return cached[0]
+    return _extract(path, digest, cache).text
+
+
+def analyze_resume(path, digest=None):
+    """
+    (text, skills, partial_reason) for the resume at path, served from the
+    cache when possible. partial_reason is None when the text is complete.
+    """
+    from extensions.ai.skills import get_skill_matcher
+    digest = digest or file_digest(path)
+    cache = get_extraction_cache()
+    matcher = get_skill_matcher()
+    cached = cache.get(digest)
+    if cached is not None:
+        text, skills, version, partial_reason = cached
+        if skills is not None and version == matcher.version:
+            return text, skills, partial_reason
+    else:
+        extraction = _extract(path, digest, cache)
+        text, partial_reason = extraction.text, extraction.reason
+    skills = matcher.extract(text)
+    cache.put_skills(digest, skills, matcher.version)
+    return text, skills, partial_reason
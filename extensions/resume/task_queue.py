@@ -0,0 +1,216 @@
+"""
+SQLite-backed queue for resume processing
+upload_resume stores the file, enqueues a task and returns its id at once;
+workers claim tasks, extract and score the resume, and store the result for
+the status endpoint to report. Workers are either a thread inside the web
+process (RESUME_QUEUE_MODE=thread, the default, fine for the dev server) or
+separate processes started with scripts/resume_worker.py
+(RESUME_QUEUE_MODE=external). A claimed task carries a lease; if its worker
+dies, the task is handed out again once the lease expires.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+QUEUE_PATH = os.getenv("RESUME_QUEUE_PATH", os.path.join('instance', 'resume_tasks.sqlite3'))
+QUEUE_MODE = os.getenv("RESUME_QUEUE_MODE", "thread").lower()
+LEASE_SECONDS = float(os.getenv("RESUME_QUEUE_LEASE", "120"))
+MAX_ATTEMPTS = int(os.getenv("RESUME_QUEUE_MAX_ATTEMPTS", "3"))
+POLL_INTERVAL = float(os.getenv("RESUME_QUEUE_POLL", "1.0"))
+# Finished tasks are deleted after this many seconds
+RETENTION_SECONDS = float(os.getenv("RESUME_QUEUE_RETENTION", str(7 * 24 * 3600)))
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_tasks_status_created ON tasks (status, created_at);
+"""
+
+_queue = None
+_queue_lock = threading.Lock()
+_thread_worker = None
+_wakeup = threading.Event()
+
+
+class TaskQueue:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, payload):
+        """Add a task; returns its id."""
+        task_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO tasks (id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+            (task_id, QUEUED, json.dumps(payload), time.time()),
+        )
+        return task_id
+
+    def claim(self):
+        """
+        Take the oldest queued task (or one whose lease expired) and mark it
+        running. Returns (task_id, payload, attempts) or None.
+        """
+        conn = self._connect()
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can
+        # never select the same row
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM tasks "
+                "WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            if row['attempts'] >= MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (FAILED, "worker died while processing this resume", now, row['id']),
+                )
+                conn.execute("COMMIT")
+                return self.claim()
+            conn.execute(
+                "UPDATE tasks SET status = ?, attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                (RUNNING, now + LEASE_SECONDS, row['id']),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row['id'], json.loads(row['payload']), row['attempts'] + 1
+
+    def _finish(self, task_id, status, result=None, error=None):
+        self._connect().execute(
+            "UPDATE tasks SET status = ?, result = ?, error = ?, lease_until = NULL, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), task_id),
+        )
+
+    def complete(self, task_id, result):
+        self._finish(task_id, DONE, result=result)
+
+    def fail(self, task_id, error):
+        self._finish(task_id, FAILED, error=error)
+
+    def get(self, task_id):
+        """Task status dict, or None for an unknown id."""
+        row = self._connect().execute(
+            "SELECT id, status, payload, result, error, attempts, created_at, finished_at FROM tasks WHERE id = ?",
+            (task_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        task = dict(row)
+        task['payload'] = json.loads(task['payload'])
+        task['result'] = json.loads(task['result']) if task['result'] else None
+        return task
+
+    def prune(self, older_than=None):
+        cutoff = time.time() - (RETENTION_SECONDS if older_than is None else older_than)
+        self._connect().execute(
+            "DELETE FROM tasks WHERE status IN (?, ?) AND finished_at < ?", (DONE, FAILED, cutoff)
+        )
+
+    def counts(self):
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+def get_task_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = TaskQueue(QUEUE_PATH)
+    return _queue
+
+
+def process(payload):
+    """Extract and score one uploaded resume. Needs an app context."""
+    from .views import score_uploaded_resume
+    score, feedback = score_uploaded_resume(payload['path'], payload['digest'], payload['job_description'])
+    return {'score': score, 'feedback': feedback, 'filename': payload['filename']}
+
+
+def work_once(app, queue=None):
+    """Claim and process one task. Returns False when the queue is empty."""
+    queue = queue or get_task_queue()
+    claimed = queue.claim()
+    if claimed is None:
+        return False
+    task_id, payload, attempts = claimed
+    with app.app_context():
+        try:
+            queue.complete(task_id, process(payload))
+        except Exception as e:
+            app.logger.exception(f"Resume task {task_id} failed (attempt {attempts})")
+            queue.fail(task_id, str(e) or type(e).__name__)
+    return True
+
+
+def run_worker(app, stop=None, poll_interval=None):
+    """Process tasks until stop (a threading/multiprocessing Event) is set."""
+    poll_interval = POLL_INTERVAL if poll_interval is None else poll_interval
+    queue = get_task_queue()
+    while stop is None or not stop.is_set():
+        try:
+            if work_once(app, queue):
+                continue
+        except Exception as e:
+            app.logger.error(f"Resume worker error: {e}")
+        _wakeup.wait(poll_interval)
+        _wakeup.clear()
+
+
+def enqueue_resume(app, filename, digest, path, job_description):
+    """Queue a stored upload for scoring; returns the task id."""
+    task_id = get_task_queue().enqueue({
+        'filename': filename,
+        'digest': digest,
+        'path': path,
+        'job_description': job_description,
+    })
+    if QUEUE_MODE == 'thread':
+        _ensure_thread_worker(app)
+        _wakeup.set()
+    return task_id
+
+
+def _ensure_thread_worker(app):
+    global _thread_worker
+    with _queue_lock:
+        if _thread_worker is None or not _thread_worker.is_alive():
+            _thread_worker = threading.Thread(target=run_worker, args=(app,), name='resume-worker', daemon=True)
+            _thread_worker.start()
@@ -1,59 +1,215 @@
-import os
+import csv
+import io
+import json
+import tempfile
 from flask import (
     render_template, request, current_app,
-    redirect, flash, url_for
+    redirect, flash, url_for, jsonify, Response, stream_with_context
 )
 from werkzeug.utils import secure_filename
 from . import resume_bp
+from .store import STORE_DIR
 
-UPLOAD_FOLDER = os.path.join('uploads', 'resumes')
+# Uploads are stored by content hash; see store.py
+UPLOAD_FOLDER = STORE_DIR
 ALLOWED = {'pdf', 'docx', 'doc', 'txt'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED
 
+def _save_upload(f):
+    """Store an upload by content hash. Returns (display filename, digest, path)."""
+    from .store import save_resume
+    digest, path = save_resume(f, UPLOAD_FOLDER)
+    return secure_filename(f.filename), digest, path
+
+def score_uploaded_resume(path, digest, job_desc):
+    """Extract and score a stored resume. Runs in a queue worker; returns (score, feedback)."""
+    try:
+        # Try to use real ATS module
+        from extensions.ai.ats import ats_score
+        from .store import analyze_resume
+        # Served from the extraction cache if this file was seen before
+        text, skills, partial_reason = analyze_resume(path, digest)
+        score, feedback = ats_score(text, job_desc, skills=skills)
+        if partial_reason:
+            # Scored on the text extracted before a size/page/time limit hit
+            feedback['partial_text'] = partial_reason
+    except (ImportError, RuntimeError) as e:
+        # Fall back to simple scoring if AI module not available
+        current_app.logger.warning(f"Real ATS not available, using fallback: {e}")
+        text = extract_text_from_file_simple(path)
+        score, feedback = simple_ats_score(text)
+    return score, feedback
+
 @resume_bp.route('/', methods=['GET', 'POST'])
 def upload_resume():
     if not current_app.config['FEATURE_FLAGS'].get('RESUME_UPLOAD', False):
         return "Feature disabled", 404
+    wants_json = request.args.get('format') == 'json'
     
     if request.method == 'POST':
         f = request.files.get('resume')
         if not f or not allowed_file(f.filename):
+            if wants_json:
+                return jsonify({'error': 'Invalid file or missing file.'}), 400
             flash("Invalid file or missing file.")
             return redirect(request.url)
         
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filename = secure_filename(f.filename)
-        path = os.path.join(UPLOAD_FOLDER, filename)
-        f.save(path)
+        try:
+            filename, digest, path = _save_upload(f)
+            # Get job description from form or use default
+            job_desc = request.form.get('job_description', 
+                'Machine learning engineer with Python, SQL, and NLP experience.')
+            # Parsing and scoring happen in a queue worker; see task_queue.py
+            from .task_queue import enqueue_resume
+            task_id = enqueue_resume(current_app._get_current_object(), filename, digest, path, job_desc)
+        except Exception as e:
+            current_app.logger.exception("Resume upload failed")
+            if wants_json:
+                return jsonify({'error': str(e)}), 500
+            flash(f"Error processing resume: {str(e)}")
+            return redirect(request.url)
         
+        if wants_json:
+            return jsonify({'task_id': task_id, 'status': 'queued',
+                            'status_url': url_for('resume.resume_task', task_id=task_id, format='json')}), 202
+        return redirect(url_for('resume.resume_task', task_id=task_id))
+    
+    return render_template('resume/upload.html')
+
+@resume_bp.route('/tasks/<task_id>')
+def resume_task(task_id):
+    """Status of a queued resume; shows the score once a worker has finished it."""
+    if not current_app.config['FEATURE_FLAGS'].get('RESUME_UPLOAD', False):
+        return "Feature disabled", 404
+    from .task_queue import get_task_queue
+    task = get_task_queue().get(task_id)
+    if task is None:
+        if request.args.get('format') == 'json':
+            return jsonify({'error': 'Unknown task'}), 404
+        return "Unknown task", 404
+    result = task['result']
+
+    if request.args.get('format') == 'json':
+        body = {'task_id': task_id, 'status': task['status'], 'filename': task['payload']['filename']}
+        if result:
+            body.update(score=result['score'], feedback=result['feedback'])
+        if task['error']:
+            body['error'] = task['error']
+        return jsonify(body)
+
+    if result:
+        return render_template('resume/result.html', score=result['score'],
+                               feedback=result['feedback'], filename=result['filename'])
+    return render_template('resume/pending.html', task=task)
+
+@resume_bp.route('/jobs', methods=['GET', 'POST'])
+def match_jobs():
+    """Rank an uploaded resume against every job posting."""
+    if not current_app.config['FEATURE_FLAGS'].get('RESUME_UPLOAD', False):
+        return "Feature disabled", 404
+    wants_json = request.args.get('format') == 'json'
+
+    if request.method == 'POST':
+        f = request.files.get('resume')
+        if not f or not allowed_file(f.filename):
+            if wants_json:
+                return jsonify({'error': 'Invalid file or missing file.'}), 400
+            flash("Invalid file or missing file.")
+            return redirect(request.url)
+
+        filename, digest, path = _save_upload(f)
+        k = min(max(request.args.get('k', 10, type=int), 1), 100)
         try:
-            # Try to use real ATS module
+            from extensions.ai.job_ranker import rank_jobs
+            from models import Job
+            from .store import resume_text
             try:
-                from extensions.ai.ats import extract_text_from_file, ats_score
-                text = extract_text_from_file(path)
-                
-                # Get job description from form or use default
-                job_desc = request.form.get('job_description', 
-                    'Machine learning engineer with Python, SQL, and NLP experience.')
-                
-                score, feedback = ats_score(text, job_desc)
-            except (ImportError, RuntimeError) as e:
-                # Fall back to simple scoring if AI module not available
-                current_app.logger.warning(f"Real ATS not available, using fallback: {e}")
+                text = resume_text(path, digest)
+            except RuntimeError:
                 text = extract_text_from_file_simple(path)
-                score, feedback = simple_ats_score(text)
-            
-            return render_template('resume/result.html', score=score, feedback=feedback, filename=filename)
-        
+            ranked = rank_jobs(text, k=k)
+            jobs = {job.id: job for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in ranked]))}
+            matches = [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
+            from extensions.ai.job_vectors import job_skills
+            skills = job_skills(jobs.values())
         except Exception as e:
-            current_app.logger.exception("Resume processing failed")
-            flash(f"Error processing resume: {str(e)}")
+            current_app.logger.exception("Job matching failed")
+            if wants_json:
+                return jsonify({'error': str(e)}), 500
+            flash(f"Error matching jobs: {str(e)}")
             return redirect(request.url)
-    
+
+        if wants_json:
+            return jsonify({'filename': filename, 'matches': [
+                {'job_id': job.id, 'title': job.title, 'company': job.company, 'score': score,
+                 'skills': skills[job.id]}
+                for job, score in matches
+            ]})
+        return render_template('resume/job_matches.html', filename=filename, matches=matches, skills=skills)
+
     return render_template('resume/upload.html')
 
+def _csv_rows(results):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(['rank', 'filename', 'score', 'skills', 'partial', 'error'])
+    for r in results:
+        writer.writerow([r['rank'], r['filename'], r['score'], ';'.join(r['skills']),
+                         r['partial'] or '', r['error'] or ''])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+def _json_rows(results):
+    yield '{"results": ['
+    for i, r in enumerate(results):
+        yield (',' if i else '') + json.dumps(r)
+    yield ']}'
+
+@resume_bp.route('/bulk', methods=['GET', 'POST'])
+def bulk_screen():
+    """Score many resumes (files or a ZIP) against one job; returns a ranked CSV or JSON."""
+    if not current_app.config['FEATURE_FLAGS'].get('RESUME_UPLOAD', False):
+        return "Feature disabled", 404
+    from models import Job
+
+    if request.method == 'POST':
+        from extensions.ai.ats_model import job_document
+        from .bulk import BulkUploadError, save_uploads, screen
+
+        job_id = request.form.get('job_id', type=int)
+        job = Job.query.get(job_id) if job_id else None
+        job_text = job_document(job) if job else request.form.get('job_description', '').strip()
+        if job:
+            # Posted jobs carry a precomputed vector; see job_vectors.py
+            from extensions.ai.job_vectors import job_vector
+            job_vec = job_vector(job)
+        else:
+            job_vec = None
+        if not job_text:
+            return jsonify({'error': 'Choose a job or paste a job description.'}), 400
+
+        with tempfile.TemporaryDirectory(prefix='bulk-') as tmp_dir:
+            try:
+                uploads = save_uploads(request.files.getlist('resumes'), tmp_dir, allowed_file)
+            except BulkUploadError as e:
+                return jsonify({'error': str(e)}), 400
+            if not uploads:
+                return jsonify({'error': 'No resumes found in the upload.'}), 400
+            results = screen(uploads, job_text, job_vec)
+        current_app.logger.info(f"Bulk screened {len(results)} resumes")
+
+        if request.form.get('format', request.args.get('format')) == 'json':
+            return Response(stream_with_context(_json_rows(results)), mimetype='application/json')
+        return Response(stream_with_context(_csv_rows(results)), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=screening.csv'})
+
+    from .bulk import MAX_FILES
+    jobs = Job.query.order_by(Job.created_at.desc()).all()
+    return render_template('resume/bulk.html', jobs=jobs, max_files=MAX_FILES)
+
 # Fallback simple scorer and text extractor
 def simple_ats_score(text, job_keywords=None):
     if job_keywords is None:
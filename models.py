@@ -21,6 +21,7 @@ class User(UserMixin, db.Model):
     answers = db.relationship('Answer', backref='author', lazy=True, cascade='all, delete-orphan')
     events = db.relationship('Event', backref='creator', lazy=True, cascade='all, delete-orphan')
     jobs = db.relationship('Job', backref='poster', lazy=True, cascade='all, delete-orphan')
+    mentor_vector = db.relationship('MentorVector', backref='user', uselist=False, cascade='all, delete-orphan')
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -59,3 +60,43 @@ class Job(db.Model):
     requirements = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     posted_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    vector = db.relationship('JobVector', backref='job', uselist=False, cascade='all, delete-orphan')
+
+class JobVector(db.Model):
+    """Precomputed TF-IDF vector and skills of a Job; see extensions/ai/job_vectors.py"""
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True)
+    model_version = db.Column(db.String(64))  # None when no ATS model was fitted
+    indices = db.Column(db.LargeBinary)  # int32 column indices of the sparse row
+    weights = db.Column(db.LargeBinary)  # float32 values, L2-normalized
+    skills = db.Column(db.Text)  # JSON list of canonical skill names
+    skills_version = db.Column(db.String(64))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class MentorVector(db.Model):
+    """Stored TF-IDF profile vector of a mentor; see extensions/matching/mentor_vectors.py"""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    model_version = db.Column(db.String(64), nullable=False)
+    indices = db.Column(db.LargeBinary, nullable=False)  # int32 column indices of the sparse row
+    weights = db.Column(db.LargeBinary, nullable=False)  # float32 values, L2-normalized
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Lets the per-request change check (count, max updated_at) read only the index
+    __table_args__ = (db.Index('ix_mentor_vector_version_updated', 'model_version', 'updated_at'),)
+
+class RecommendationRun(db.Model):
+    """One batch materialization of mentor recommendations; see extensions/matching/batch.py"""
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, index=True)  # None while running or if it failed
+    top_n = db.Column(db.Integer, nullable=False)
+    model_version = db.Column(db.String(64))
+    students = db.Column(db.Integer, default=0)
+
+class MentorRecommendation(db.Model):
+    run_id = db.Column(db.Integer, db.ForeignKey('recommendation_run.id', ondelete='CASCADE'), primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    mentor_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    skill_match = db.Column(db.Float, nullable=False)  # cosine similarity, 0-1
+    profile_hash = db.Column(db.String(16), nullable=False)  # student profile the row was computed from
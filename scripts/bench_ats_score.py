@@ -0,0 +1,85 @@
+"""Benchmark per-request ATS similarity: fit-per-request vs a fitted corpus model.
+
+Generates synthetic job postings and resumes, fits the corpus model once, then
+times the similarity step of `ats_score` both ways: fitting a TfidfVectorizer
+on the (resume, job) pair as before, and calling transform() on the fitted
+model. Reports mean, p50 and p99 latency per request.
+
+Usage:
+    python scripts/bench_ats_score.py
+    python scripts/bench_ats_score.py --jobs 20000 --requests 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extensions.ai.ats import model_similarity, pairwise_similarity
+from extensions.ai.ats_model import make_vectorizer
+
+SKILLS = [
+    'python', 'sql', 'java', 'javascript', 'typescript', 'react', 'flask', 'django',
+    'docker', 'kubernetes', 'aws', 'gcp', 'azure', 'machine learning', 'nlp',
+    'deep learning', 'pytorch', 'tensorflow', 'spark', 'airflow', 'tableau', 'excel',
+    'git', 'linux', 'agile', 'scrum', 'leadership', 'communication', 'testing', 'ci/cd',
+]
+FILLER = (
+    'team product customer build design deliver own improve scale data platform service '
+    'system feature project experience year strong work cross functional stakeholder '
+    'analysis report pipeline model deploy monitor support mentor review quality'
+).split()
+
+
+def synthetic_texts(n, words, seed):
+    rng = np.random.default_rng(seed)
+    texts = []
+    for _ in range(n):
+        skills = rng.choice(SKILLS, size=rng.integers(4, 10), replace=False)
+        filler = rng.choice(FILLER, size=rng.integers(words // 2, words))
+        texts.append(" ".join(list(filler) + [f"experience with {s}" for s in skills]))
+    return texts
+
+
+def time_calls(fn, pairs):
+    latencies = np.empty(len(pairs))
+    for i, (resume, job) in enumerate(pairs):
+        started = time.perf_counter()
+        fn(resume, job)
+        latencies[i] = time.perf_counter() - started
+    return latencies * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5000, help='job postings in the fitting corpus')
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--resume-words', type=int, default=400)
+    args = parser.parse_args()
+
+    jobs = synthetic_texts(args.jobs, 120, seed=0)
+    resumes = synthetic_texts(args.requests, args.resume_words, seed=1)
+    pairs = list(zip(resumes, jobs))
+
+    started = time.perf_counter()
+    vect = make_vectorizer().fit(jobs + resumes)
+    print(f"Fitted corpus model on {len(jobs) + len(resumes)} texts in "
+          f"{time.perf_counter() - started:.2f}s ({len(vect.vocabulary_)} terms)\n")
+
+    print(f"{'method':>16} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, fn in (
+        ('fit per request', pairwise_similarity),
+        ('fitted model', lambda resume, job: model_similarity(vect, resume, job)),
+    ):
+        latencies = time_calls(fn, pairs)
+        print(f"{name:>16} {latencies.mean():>9.3f} {np.percentile(latencies, 50):>8.3f} "
+              f"{np.percentile(latencies, 99):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Measure how long `import app` takes and which modules it pulls in.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter a few times
+and reports the best total plus the slowest top-level imports. Fails (exit 1)
+if the import takes longer than --max-ms or loads any module listed in
+--forbid, so startup regressions can be caught in CI.
+
+Usage:
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py --runs 5 --max-ms 1000 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies that must only load on first use (see extensions/ai/lazy.py)
+HEAVY_MODULES = 'sklearn,scipy,faiss,spacy,pdfminer,docx,joblib'
+
+
+def importtime(module):
+    """Return [(self_us, cumulative_us, depth, name)] for one cold import."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=0, help='fail above this total (0 = no limit)')
+    parser.add_argument('--forbid', default=HEAVY_MODULES,
+                        help='comma-separated top-level packages that must not be imported')
+    args = parser.parse_args()
+
+    runs = [importtime(args.module) for _ in range(args.runs)]
+    totals = [max(r[1] for r in rows if r[3] == args.module) / 1000 for rows in runs]
+    best = runs[totals.index(min(totals))]
+    print(f"import {args.module}: best {min(totals):.1f} ms, worst {max(totals):.1f} ms over {args.runs} runs\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    top_level = sorted((r for r in best if r[2] == 1), key=lambda r: -r[1])
+    for self_us, cumulative_us, _, name in top_level[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+
+    failed = False
+    forbidden = {m.strip() for m in args.forbid.split(',') if m.strip()}
+    loaded = sorted({r[3] for r in best} & forbidden)
+    if loaded:
+        print(f"\nFAIL: importing {args.module} loads {', '.join(loaded)}")
+        failed = True
+    if args.max_ms and min(totals) > args.max_ms:
+        print(f"\nFAIL: {min(totals):.1f} ms exceeds the {args.max_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
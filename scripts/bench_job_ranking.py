@@ -0,0 +1,69 @@
+"""Benchmark ranking one resume against every job posting.
+
+Builds a synthetic job table, vectorizes it with the corpus TF-IDF model into
+one sparse matrix, then times `rank_against` (resume transform, one sparse
+matrix-vector product and argpartition top-k) per resume. The target is under
+100 ms per resume at 50k postings.
+
+Usage:
+    python scripts/bench_job_ranking.py
+    python scripts/bench_job_ranking.py --jobs 10000,50000,200000 --k 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extensions.ai.ats_model import make_vectorizer
+from extensions.ai.job_ranker import rank_against
+
+
+def synthetic_vocabulary(n_terms, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    return ["".join(rng.choice(letters, size=rng.integers(4, 10))) for _ in range(n_terms)]
+
+
+def synthetic_texts(n, vocab, words, seed):
+    """Zipf-distributed word draws, like real job postings and resumes."""
+    rng = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(1.2, size=(n, words)), len(vocab)) - 1
+    return [" ".join(vocab[i] for i in row) for row in ranks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', default='10000,50000', help='comma-separated job counts')
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    vocab = synthetic_vocabulary(30000)
+    resumes = synthetic_texts(args.resumes, vocab, 500, seed=1)
+    print(f"{'jobs':>8} {'terms':>7} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for n in [int(x) for x in args.jobs.split(',') if x]:
+        jobs = synthetic_texts(n, vocab, 150, seed=n)
+        started = time.perf_counter()
+        vect = make_vectorizer().fit(jobs)
+        matrix = vect.transform(jobs).tocsr()
+        ids = np.arange(1, n + 1, dtype=np.int64)
+        build = time.perf_counter() - started
+
+        latencies = np.empty(len(resumes))
+        for i, resume in enumerate(resumes):
+            started = time.perf_counter()
+            rank_against(vect, matrix, ids, resume, args.k)
+            latencies[i] = time.perf_counter() - started
+        latencies *= 1000
+        print(f"{n:>8} {len(vect.vocabulary_):>7} {build:>8.2f} "
+              f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 99):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
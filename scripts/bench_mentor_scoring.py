@@ -0,0 +1,74 @@
+"""Benchmark mentor recommendation over the full alumni corpus.
+
+Builds synthetic alumni profiles, vectorizes them into one sparse TF-IDF
+matrix as db_mcs does, then times `rank_mentors` (student transform, one
+sparse matrix-vector product and argpartition top-k) per student. The old
+per-request path (refit on 20 mentors, Python loop of dot products) is timed
+alongside for reference. The target is under 50 ms per student at 100k alumni.
+
+Usage:
+    python scripts/bench_mentor_scoring.py
+    python scripts/bench_mentor_scoring.py --alumni 10000,100000,300000 --k 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extensions.matching.db_mcs import rank_mentors
+from extensions.matching.mentor_vectors import build_mentor_matrix
+from scripts.bench_job_ranking import synthetic_texts, synthetic_vocabulary
+
+
+def old_scoring(student, mentors):
+    """The previous implementation: refit per call, loop over 20 mentors."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    mat = TfidfVectorizer(stop_words='english', max_features=50).fit_transform([student] + mentors).toarray()
+    return sorted((float(np.dot(mat[0], row) / ((np.linalg.norm(mat[0]) * np.linalg.norm(row)) + 1e-9))
+                   for row in mat[1:]), reverse=True)
+
+
+def percentiles(latencies):
+    latencies = np.asarray(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--alumni', default='10000,100000', help='comma-separated alumni counts')
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    vocab = synthetic_vocabulary(20000)
+    students = synthetic_texts(args.students, vocab, 60, seed=1)
+    print(f"{'alumni':>8} {'terms':>7} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8} {'old(20) p50':>12}")
+    for n in [int(x) for x in args.alumni.split(',') if x]:
+        profiles = synthetic_texts(n, vocab, 60, seed=n)
+        started = time.perf_counter()
+        vect, matrix = build_mentor_matrix(profiles)
+        ids = np.arange(1, n + 1, dtype=np.int64)
+        build = time.perf_counter() - started
+
+        latencies, old = [], []
+        for student in students:
+            started = time.perf_counter()
+            rank_mentors(vect, matrix, ids, student, args.k, exclude_id=1)
+            latencies.append(time.perf_counter() - started)
+        for student in students[:50]:
+            started = time.perf_counter()
+            old_scoring(student, profiles[:20])
+            old.append(time.perf_counter() - started)
+        p50, p99 = percentiles(latencies)
+        print(f"{n:>8} {len(vect.vocabulary_):>7} {build:>8.2f} {p50:>8.2f} {p99:>8.2f} "
+              f"{percentiles(old)[0]:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
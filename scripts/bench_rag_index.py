@@ -0,0 +1,101 @@
+"""Benchmark ANN index types for the AskAlum retriever.
+
+Builds flat, IVF-Flat and HNSW indexes over synthetic clustered vectors (the
+same shape as text-embedding-3-small output) and reports build time, recall@k
+against the exact flat baseline, and p50/p99 single-query search latency.
+
+Usage:
+    python scripts/bench_rag_index.py
+    python scripts/bench_rag_index.py --sizes 10000,100000 --queries 500 --k 5
+
+The 1M-document run needs roughly 6 GB of RAM for the vectors alone (plus the
+HNSW graph); pass --sizes to skip it on smaller machines.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extensions.ai.ann_index import INDEX_TYPES, make_index
+
+
+def topic_centroids(dim, n_clusters=256, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    return centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+
+def synthetic_vectors(n, centroids, seed=0, chunk=50000):
+    """Gaussian mixture around topic centroids, like clustered text embeddings."""
+    rng = np.random.default_rng(seed)
+    n_clusters, dim = centroids.shape
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        labels = rng.integers(0, n_clusters, stop - start)
+        noise = rng.standard_normal((stop - start, dim), dtype=np.float32) * 0.04
+        out[start:stop] = centroids[labels] + noise
+    return out
+
+
+def recall_at_k(found, truth):
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def search_latencies(index, queries, k):
+    latencies = np.empty(len(queries))
+    results = np.empty((len(queries), k), dtype=np.int64)
+    for i, q in enumerate(queries):
+        started = time.perf_counter()
+        _, ids = index.search(q[None, :], k)
+        latencies[i] = time.perf_counter() - started
+        results[i] = ids[0]
+    return latencies * 1000, results
+
+
+def run(sizes, dim, n_queries, k, kinds):
+    print(f"{'docs':>9} {'index':>6} {'build s':>9} {'recall@' + str(k):>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for n in sizes:
+        centroids = topic_centroids(dim)
+        data = synthetic_vectors(n, centroids, seed=n)
+        queries = synthetic_vectors(n_queries, centroids, seed=n + 1)
+        truth = None
+        for kind in ('flat',) + tuple(x for x in kinds if x != 'flat'):
+            started = time.perf_counter()
+            index = make_index(kind, dim, train_vectors=data if kind == 'ivf' else None)
+            index.add(data)
+            build = time.perf_counter() - started
+            latencies, found = search_latencies(index, queries, k)
+            if truth is None:
+                truth = found
+            recall = recall_at_k(found, truth)
+            print(f"{n:>9} {kind:>6} {build:>9.2f} {recall:>9.3f} "
+                  f"{np.percentile(latencies, 50):>8.3f} {np.percentile(latencies, 99):>8.3f}")
+            del index
+        del data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='comma-separated corpus sizes')
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--types', default=','.join(INDEX_TYPES),
+                        help='index types to compare against flat')
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    kinds = [t.strip() for t in args.types.split(',') if t.strip()]
+    run(sizes, args.dim, args.queries, args.k, kinds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark skill extraction against a large taxonomy.
+
+Generates a synthetic taxonomy (single- and multi-word skills with aliases)
+and synthetic resumes, then compares the old per-skill substring scan with the
+compiled token-trie SkillMatcher: build time and p50/p99 latency per resume.
+
+Usage:
+    python scripts/bench_skill_extraction.py
+    python scripts/bench_skill_extraction.py --skills 1000,10000,50000 --words 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extensions.ai.skills import SkillMatcher
+
+
+def synthetic_words(n, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    return list({"".join(rng.choice(letters, size=rng.integers(3, 9))) for _ in range(n)})
+
+
+def synthetic_taxonomy(n_skills, words, seed=0):
+    rng = np.random.default_rng(seed)
+    taxonomy = {}
+    while len(taxonomy) < n_skills:
+        name = " ".join(rng.choice(words, size=rng.integers(1, 4)))
+        taxonomy[name] = [" ".join(rng.choice(words, size=rng.integers(1, 3)))
+                          for _ in range(rng.integers(0, 3))]
+    return taxonomy
+
+
+def synthetic_resumes(n, words, skills, n_words, seed=1):
+    rng = np.random.default_rng(seed)
+    resumes = []
+    for _ in range(n):
+        text = list(rng.choice(words, size=n_words))
+        for skill in rng.choice(skills, size=20):
+            text.insert(int(rng.integers(0, len(text))), skill)
+        resumes.append(" ".join(text))
+    return resumes
+
+
+def substring_scan(text, vocab):
+    """The previous extract_skills_simple: one `in` test per skill."""
+    text = text.lower()
+    return list({s for s in vocab if s in text})
+
+
+def timed(fn, resumes):
+    latencies = np.empty(len(resumes))
+    for i, resume in enumerate(resumes):
+        started = time.perf_counter()
+        fn(resume)
+        latencies[i] = time.perf_counter() - started
+    return latencies * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--skills', default='1000,10000')
+    parser.add_argument('--resumes', type=int, default=100)
+    parser.add_argument('--words', type=int, default=800, help='words per resume')
+    args = parser.parse_args()
+
+    words = synthetic_words(20000)
+    print(f"{'skills':>7} {'method':>15} {'build ms':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for n in [int(x) for x in args.skills.split(',') if x]:
+        taxonomy = synthetic_taxonomy(n, words, seed=n)
+        vocab = [phrase for name, aliases in taxonomy.items() for phrase in (name, *aliases)]
+        resumes = synthetic_resumes(args.resumes, words, list(taxonomy), args.words)
+
+        started = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build = (time.perf_counter() - started) * 1000
+        for name, fn, build_ms in (
+            ('substring scan', lambda text: substring_scan(text, vocab), 0.0),
+            ('token trie', matcher.extract, build),
+        ):
+            latencies = timed(fn, resumes)
+            print(f"{n:>7} {name:>15} {build_ms:>9.1f} {np.percentile(latencies, 50):>8.3f} "
+                  f"{np.percentile(latencies, 99):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
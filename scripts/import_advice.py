@@ -3,12 +3,15 @@
 This repository uses a single-file `app.py` rather than an application factory.
 This script imports the running Flask `app` and, as a fallback, a small
 `SAMPLE_ADVICE` set from the AskAlum extension so it can be run without DB
-models present. It calls `extensions.ai.rag_faiss.add_document` to seed the
-index (development only).
+models present. It calls `extensions.ai.rag_faiss.add_documents` to seed the
+index in embedding batches and `save_index` to write a snapshot that workers load at startup.
+Existing forum answers are imported too; new ones are indexed live by
+`extensions.ask_alum.indexer`.
 
 Usage:
     python scripts/import_advice.py
 """
+import itertools
 import os
 import sys
 
@@ -17,7 +20,9 @@ ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
 
 from app import app
-from extensions.ai.rag_faiss import add_document, _ensure_index
+from extensions.ai.rag_faiss import add_documents, clear_index, save_index
+from extensions.ask_alum.indexer import answer_document
+from models import Answer
 
 # Try import of a DB-backed Advice model; fall back to sample advice
 SAMPLE = None
@@ -39,20 +44,30 @@ except Exception:
 
 def import_advice_to_rag():
     with app.app_context():
-        _ensure_index()
-        count = 0
-        for item in SAMPLE:
-            doc_id = f"advice_{item.get('id')}"
-            text = item.get('content', '')
-            meta = {'author': item.get('author')}
-            try:
-                add_document(doc_id, text, meta)
-                print(f"Imported {doc_id}")
-                count += 1
-            except Exception as e:
-                print(f"Failed to import {doc_id}: {e}")
-
-        print(f"\nImported {count} documents into the RAG index (dev only)")
+        # Rebuild from scratch rather than appending to the last snapshot
+        clear_index()
+        advice = (
+            (f"advice_{item.get('id')}", item.get('content', ''), {'author': item.get('author')})
+            for item in SAMPLE
+        )
+        answers = (answer_document(a) for a in Answer.query.yield_per(500))
+        docs = itertools.chain(advice, answers)
+
+        def report(stats):
+            print(f"Batch {stats['batch']}: {stats['size']} docs in {stats['seconds']}s "
+                  f"({stats['docs_per_sec']} docs/s)")
+
+        try:
+            count = add_documents(docs, on_batch=report)
+        except Exception as e:
+            count = 0
+            print(f"Failed to import advice: {e}")
+
+        if count:
+            version = save_index()
+            print(f"Saved RAG snapshot v{version}")
+
+        print(f"\nImported {count} documents into the RAG index")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,42 @@
+"""Materialize the top mentors of every student (run nightly).
+
+Scores all students against all mentors in blocks and stores the top N per
+student in the mentor_recommendation table; /mcs/recommend serves those rows
+and scores live only students whose profile changed after the run. Example
+crontab entry:
+
+    30 2 * * *  cd /srv/gradlink && python scripts/materialize_recommendations.py
+
+Usage:
+    python scripts/materialize_recommendations.py
+    python scripts/materialize_recommendations.py --top-n 20 --block-size 256
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import app
+from extensions.matching.batch import BLOCK_SIZE, TOP_N, materialize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top-n', type=int, default=TOP_N)
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='students scored per block')
+    args = parser.parse_args()
+
+    with app.app_context():
+        started = time.perf_counter()
+        run = materialize(top_n=args.top_n, block_size=args.block_size)
+        print(f"Run {run.id}: top {run.top_n} mentors for {run.students} students "
+              f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Refit the corpus-level TF-IDF model used by ATS scoring.
+
+Fits on every Job posting in the database plus the resumes already in the
+resume store (text comes from the extraction cache where possible), then
+writes the model to ATS_TFIDF_PATH (default instance/ats_tfidf.joblib).
+Stored job vectors are recomputed under the new model. Running workers
+reload the model when its file changes.
+
+Usage:
+    python scripts/refit_ats_model.py
+    python scripts/refit_ats_model.py --resume-dir uploads/resumes --output instance/ats_tfidf.joblib
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import app
+from extensions.ai.ats_model import MODEL_PATH, fit_vectorizer, job_document
+from extensions.ai.job_vectors import refresh_stale
+from extensions.resume.store import resume_text
+from extensions.resume.views import UPLOAD_FOLDER, allowed_file
+from models import Job
+
+
+def resume_texts(resume_dir):
+    for dirpath, _, names in os.walk(resume_dir):
+        for name in sorted(names):
+            if not allowed_file(name):
+                continue
+            try:
+                yield resume_text(os.path.join(dirpath, name))
+            except Exception as e:
+                print(f"Skipping {name}: {e}")
+
+
+def build_corpus(resume_dir):
+    jobs = [job_document(job) for job in Job.query.yield_per(1000)]
+    resumes = [text for text in resume_texts(resume_dir) if text and text.strip()]
+    return jobs, resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resume-dir', default=UPLOAD_FOLDER)
+    parser.add_argument('--output', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    with app.app_context():
+        jobs, resumes = build_corpus(args.resume_dir)
+        if not jobs and not resumes:
+            print("No job postings or resumes to fit on; model left unchanged")
+            return 1
+        started = time.perf_counter()
+        vect = fit_vectorizer(jobs + resumes, path=args.output)
+        print(f"Fitted on {len(jobs)} jobs and {len(resumes)} resumes "
+              f"({len(vect.vocabulary_)} terms) in {time.perf_counter() - started:.2f}s")
+        print(f"Saved model to {args.output}")
+        # Stored job vectors belong to the old model; recompute them now
+        # rather than on the first ranking request
+        print(f"Re-vectorized {refresh_stale()} job postings")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
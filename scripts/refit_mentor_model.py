@@ -0,0 +1,37 @@
+"""Refit the mentor TF-IDF model and re-vectorize every mentor profile.
+
+The model is fitted automatically on the first recommendation request;
+profile edits after that reuse its vocabulary, so terms that no mentor used
+at fit time are ignored until the next refit. Running workers reload the
+model when its file changes.
+
+Usage:
+    python scripts/refit_mentor_model.py
+"""
+import os
+import sys
+import time
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import app
+from extensions.matching.mentor_vectors import MODEL_PATH, rebuild
+
+
+def main():
+    with app.app_context():
+        started = time.perf_counter()
+        done = rebuild()
+        if done is None:
+            print("No mentor profiles with text to fit on; model left unchanged")
+            return 1
+        # 0 when the profiles, and so the model, have not changed since the last fit
+        print(f"Re-vectorized {done} mentors in {time.perf_counter() - started:.2f}s")
+        print(f"Saved model to {MODEL_PATH}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
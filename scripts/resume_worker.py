@@ -0,0 +1,62 @@
+"""Run resume-processing workers for the upload queue.
+
+Use with RESUME_QUEUE_MODE=external on the web processes: uploads are then
+only stored and queued, and these workers do the parsing and scoring. Each
+worker is a separate process claiming tasks from RESUME_QUEUE_PATH; tasks of
+a worker that dies are retried by another once their lease expires.
+
+Usage:
+    python scripts/resume_worker.py
+    python scripts/resume_worker.py --workers 4 --poll 0.5
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+
+# Ensure project root is on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def worker(stop, poll):
+    # Parent handles Ctrl-C and sets stop; let the current task finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from app import app
+    from extensions.resume.task_queue import run_worker
+    app.logger.info(f"Resume worker {os.getpid()} started")
+    run_worker(app, stop=stop, poll_interval=poll)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=int(os.getenv('RESUME_WORKERS', '2')))
+    parser.add_argument('--poll', type=float, default=None, help='seconds between polls of an empty queue')
+    parser.add_argument('--prune', action='store_true', help='delete old finished tasks and exit')
+    args = parser.parse_args()
+
+    if args.prune:
+        from extensions.resume.task_queue import get_task_queue
+        queue = get_task_queue()
+        queue.prune()
+        print(queue.counts())
+        return
+
+    ctx = multiprocessing.get_context('spawn')
+    stop = ctx.Event()
+    procs = [ctx.Process(target=worker, args=(stop, args.poll), name=f'resume-worker-{i}')
+             for i in range(max(args.workers, 1))]
+    for proc in procs:
+        proc.start()
+
+    def shutdown(*_):
+        stop.set()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    for proc in procs:
+        proc.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import zlib
+
+import numpy as np
+import pytest
+
+
+def _fake_embed(text):
+    rng = np.random.default_rng(zlib.crc32(text.encode('utf-8')))
+    return rng.random(1536, dtype=np.float32)
+
+
+@pytest.fixture
+def forum(monkeypatch, tmp_path):
+    pytest.importorskip('faiss')
+    from extensions.ai import rag_faiss
+    from app import app as flask_app
+    from models import db
+    monkeypatch.setattr(rag_faiss, 'embed_text', _fake_embed)
+    monkeypatch.setattr(rag_faiss, 'embed_texts', lambda texts: np.array([_fake_embed(t) for t in texts]))
+    monkeypatch.setattr(rag_faiss, 'INDEX_DIR', str(tmp_path / 'rag_index'))
+    monkeypatch.setitem(flask_app.config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'forum.db'}")
+    rag_faiss.clear_index()
+    with flask_app.app_context():
+        db.create_all()
+        yield rag_faiss
+        db.session.remove()
+        db.drop_all()
+    rag_faiss.clear_index()
+
+
+def test_answers_flow_into_index(forum):
+    from extensions.ask_alum.indexer import wait_until_indexed
+    from models import db, User, Question, Answer
+
+    user = User(username='alum', email='alum@example.com', role='alumni')
+    question = Question(title='First job?', content='How do I start?', author=user)
+    answer = Answer(content='Do internships early.', author=user, question=question)
+    db.session.add_all([user, question, answer])
+    db.session.commit()
+    wait_until_indexed()
+
+    doc_id = f"answer_{answer.id}"
+    rows = forum._doc_rows[doc_id]
+    assert forum._documents[rows[0]]['text'] == 'Do internships early.'
+    assert forum._documents[rows[0]]['meta'] == {'question_id': question.id, 'user_id': user.id}
+    assert forum._read_current_version(forum.INDEX_DIR) == forum._snapshot_version
+
+    answer.content = 'Build projects and do internships early.'
+    db.session.commit()
+    wait_until_indexed()
+    rows = forum._doc_rows[doc_id]
+    assert forum._documents[rows[0]]['text'] == 'Build projects and do internships early.'
+
+    # Rolled-back answers never reach the index
+    db.session.add(Answer(content='Draft.', author=user, question=question))
+    db.session.flush()
+    db.session.rollback()
+    wait_until_indexed()
+    assert list(forum._doc_rows) == [doc_id]
+
+    # Deleting the question cascades to its answers
+    db.session.delete(db.session.get(Question, question.id))
+    db.session.commit()
+    wait_until_indexed()
+    assert doc_id not in forum._doc_rows
+
+
+def test_snapshots_are_throttled(forum, monkeypatch):
+    import time
+    from extensions.ask_alum import indexer
+    from models import db, User, Question, Answer
+    monkeypatch.setattr(indexer, 'BATCH_WAIT', 0.05)
+    monkeypatch.setattr(indexer, 'SNAPSHOT_INTERVAL', 60)
+    saves = []
+    save_index = forum.save_index
+    monkeypatch.setattr(forum, 'save_index', lambda *a: saves.append(1) or save_index(*a))
+
+    user = User(username='alum', email='alum@example.com', role='alumni')
+    question = Question(title='First job?', content='How do I start?', author=user)
+    db.session.add_all([user, question, Answer(content='Do internships early.', author=user, question=question)])
+    db.session.commit()
+    indexer.wait_until_indexed()
+    assert len(saves) == 1
+
+    # Within the interval further answers are held, then indexed in one pass
+    for text in ('Build projects.', 'Network with alumni.'):
+        db.session.add(Answer(content=text, author=user, question=question))
+        db.session.commit()
+    time.sleep(0.3)
+    assert len(saves) == 1 and len(forum._doc_rows) == 1
+    indexer.wait_until_indexed()
+    assert len(saves) == 2 and len(forum._doc_rows) == 3
@@ -16,3 +16,46 @@ def test_ats_score_basic():
         score, feedback = ats.ats_score(resume, job)
     assert isinstance(score, float)
     assert 'skills_found' in feedback
+
+
+def test_ats_score_uses_fitted_corpus_model(monkeypatch, tmp_path):
+    from extensions.ai import ats, ats_model
+    from extensions.ai.tfidf_store import PersistedModel
+    from app import app as flask_app
+    path = str(tmp_path / 'ats_tfidf.joblib')
+    monkeypatch.setattr(ats_model, '_model', PersistedModel(path))
+    corpus = [
+        'Python developer with SQL and Docker experience.',
+        'Frontend engineer: React, TypeScript and CSS.',
+        'Data analyst with Excel, SQL and Tableau.',
+    ]
+    ats_model.fit_vectorizer(corpus, path=path)
+    assert ats_model.load_vectorizer(path) is ats_model.get_vectorizer()
+
+    # Scoring must only transform, never refit per request
+    def no_refit(*args, **kwargs):
+        raise AssertionError('vectorizer refitted per request')
+    monkeypatch.setattr(ats, 'pairwise_similarity', no_refit)
+    with flask_app.app_context():
+        close, _ = ats.ats_score('Python and SQL engineer, Docker.', corpus[0])
+        far, _ = ats.ats_score('Python and SQL engineer, Docker.', corpus[1])
+        empty, feedback = ats.ats_score('zzz qqq', corpus[0])
+    assert close > far
+    assert empty == 0.0 and 'error' in feedback
+
+
+def test_skill_matcher_word_boundaries_and_aliases(tmp_path):
+    import json
+    from extensions.ai.skills import SkillMatcher, get_skill_matcher, load_taxonomy
+    matcher = SkillMatcher({'java': [], 'javascript': ['js'], 'git': [], 'c++': ['cpp'],
+                            'machine learning': ['ml'], 'node.js': ['nodejs']})
+    text = 'JavaScript (JS) and NodeJS in digital marketing; legit C++ work. ML and Machine Learning.'
+    assert matcher.extract(text) == ['javascript', 'node.js', 'c++', 'machine learning']
+    assert matcher.extract('Java, Git.') == ['java', 'git']
+
+    path = tmp_path / 'taxonomy.json'
+    path.write_text(json.dumps({'skills': {'kubernetes': ['k8s']}}))
+    assert SkillMatcher(load_taxonomy(str(path))).extract('Ran k8s clusters') == ['kubernetes']
+    # The bundled taxonomy covers the skills the old hard-coded list knew
+    assert {'python', 'sql', 'docker', 'ci/cd', 'problem solving'} <= set(get_skill_matcher().extract(
+        'Python, SQL, Docker, CI/CD pipelines and problem-solving'))
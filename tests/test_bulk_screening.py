@@ -0,0 +1,69 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+
+def _zip(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as archive:
+        for name, text in files.items():
+            archive.writestr(name, text)
+    buf.seek(0)
+    return buf
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    from extensions.ai import ats_model, extraction
+    from extensions.ai.tfidf_store import PersistedModel
+    from extensions.resume import store
+    from app import app as flask_app
+    from models import db
+    # No fitted model on disk
+    monkeypatch.setattr(ats_model, '_model', PersistedModel(str(tmp_path / 'ats_tfidf.joblib')))
+    monkeypatch.setattr(extraction, 'WORKERS', 2)
+    monkeypatch.setattr(store, '_cache', store.ExtractionCache(str(tmp_path / 'cache.sqlite3')))
+    monkeypatch.setitem(flask_app.config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'bulk.db'}")
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def test_bulk_screen_ranks_zip_and_files(client):
+    archive = _zip({
+        'resumes/frontend.txt': 'React and TypeScript developer, CSS and accessibility.',
+        'resumes/data.txt': 'Data engineer: Python, SQL, Airflow and Spark pipelines.',
+        'resumes/notes.md': 'ignored: not a resume format',
+    })
+    data = {
+        'job_description': 'Data engineer with Python, SQL and Airflow.',
+        'resumes': [(archive, 'batch.zip'), (io.BytesIO(b'Python and SQL analyst.'), 'data.txt')],
+    }
+    response = client.post('/resume/bulk', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [r['filename'] for r in rows][0] == 'data.txt'
+    assert {r['filename'] for r in rows} == {'frontend.txt', 'data.txt', 'data_1.txt'}
+    assert [int(r['rank']) for r in rows] == [1, 2, 3]
+    assert float(rows[0]['score']) >= float(rows[1]['score']) >= float(rows[2]['score'])
+
+
+def test_bulk_screen_json_and_limits(client, monkeypatch):
+    from extensions.resume import bulk
+    data = {
+        'job_description': 'Frontend developer, React.',
+        'resumes': [(io.BytesIO(b'React developer.'), 'a.txt'), (io.BytesIO(b'Welder.'), 'b.txt')],
+        'format': 'json',
+    }
+    response = client.post('/resume/bulk', data=data, content_type='multipart/form-data')
+    assert [r['filename'] for r in response.get_json()['results']] == ['a.txt', 'b.txt']
+
+    monkeypatch.setattr(bulk, 'MAX_ZIP_BYTES', 10)
+    data = {'job_description': 'x', 'resumes': [(_zip({'big.txt': 'y' * 100}), 'big.zip')]}
+    response = client.post('/resume/bulk', data=data, content_type='multipart/form-data')
+    assert response.status_code == 400
@@ -0,0 +1,31 @@
+import pytest
+
+
+def test_sandboxed_extraction_limits(tmp_path):
+    from extensions.ai.extraction import extract_sandboxed
+    path = tmp_path / 'resume.txt'
+    path.write_text('Python and SQL. ' * 100)
+
+    full = extract_sandboxed(str(path))
+    assert full.text == path.read_text() and not full.partial
+
+    capped = extract_sandboxed(str(path), max_chars=20)
+    assert capped == ('Python and SQL. Pyth', True, 'char_limit')
+
+    too_large = extract_sandboxed(str(path), max_bytes=100)
+    assert too_large == ('', True, 'too_large')
+
+    odt = tmp_path / 'resume.odt'
+    odt.write_text('x')
+    with pytest.raises(ValueError):
+        extract_sandboxed(str(odt))
+
+
+def test_sandboxed_extraction_times_out_with_partial_text(tmp_path):
+    from extensions.ai.extraction import extract_sandboxed
+    # Streaming 50 MB through the pipe cannot finish in 20 ms
+    path = tmp_path / 'big.txt'
+    path.write_text('word ' * 10_000_000)
+    result = extract_sandboxed(str(path), timeout=0.02, max_chars=10**9, max_bytes=10**9)
+    assert result.partial and result.reason == 'timeout'
+    assert len(result.text) < path.stat().st_size
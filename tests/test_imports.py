@@ -7,3 +7,23 @@ def test_ai_modules_importable():
     assert hasattr(ats_mod, 'extract_skills_simple')
     assert hasattr(rag_mod, 'clear_index') or hasattr(rag_mod, 'add_document')
     assert hasattr(mcs_mod, 'get_recommendations_for_student')
+
+
+def test_app_import_defers_heavy_dependencies():
+    """Importing the app must not load sklearn, faiss, spaCy or pdfminer."""
+    import os
+    import subprocess
+    import sys
+    heavy = ['sklearn', 'scipy', 'faiss', 'spacy', 'pdfminer', 'docx', 'joblib']
+    code = f"import sys, app; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+
+def test_lazy_module():
+    from extensions.ai.lazy import lazy_import
+    missing = lazy_import('no_such_module_gradlink')
+    assert not missing
+    json_mod = lazy_import('json')
+    assert json_mod and json_mod.dumps([1]) == '[1]'
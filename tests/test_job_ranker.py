@@ -0,0 +1,124 @@
+import io
+
+import pytest
+
+
+@pytest.fixture
+def jobs_db(monkeypatch, tmp_path):
+    from extensions.ai import ats_model, job_ranker
+    from extensions.ai.tfidf_store import PersistedModel
+    from extensions.resume import store, views as resume_views
+    from app import app as flask_app
+    from models import db, User, Job
+    # No fitted model on disk
+    monkeypatch.setattr(ats_model, '_model', PersistedModel(str(tmp_path / 'ats_tfidf.joblib')))
+    monkeypatch.setattr(job_ranker, '_state', (None, None, None, None))
+    monkeypatch.setattr(resume_views, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(store, '_cache', store.ExtractionCache(str(tmp_path / 'cache.sqlite3')))
+    monkeypatch.setitem(flask_app.config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'jobs.db'}")
+    with flask_app.app_context():
+        db.create_all()
+        admin = User(username='admin', email='admin@example.com', role='admin')
+        db.session.add(admin)
+        db.session.add_all([
+            Job(title='Data Engineer', company='Acme', description='Python, SQL and Airflow pipelines.', poster=admin),
+            Job(title='Frontend Developer', company='Web Co', description='React, TypeScript and CSS.', poster=admin),
+            Job(title='ML Engineer', company='AI Labs', description='Python, PyTorch and NLP models.', poster=admin),
+        ])
+        db.session.commit()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_rank_jobs_orders_all_postings(jobs_db):
+    from extensions.ai.job_ranker import rank_jobs
+    from models import db, Job
+
+    ranked = rank_jobs('Built NLP models in Python with PyTorch.', k=2)
+    titles = [Job.query.get(job_id).title for job_id, _ in ranked]
+    assert titles[0] == 'ML Engineer'
+    assert len(ranked) == 2 and ranked[0][1] >= ranked[1][1]
+
+    # New postings are picked up without a restart
+    job = Job(title='React Native Developer', company='Apps', description='React Native and TypeScript.',
+              posted_by=1)
+    db.session.add(job)
+    db.session.commit()
+    assert rank_jobs('React Native TypeScript apps', k=1)[0][0] == job.id
+
+
+def test_match_jobs_endpoint(jobs_db):
+    client = jobs_db.test_client()
+    data = {'resume': (io.BytesIO(b'Frontend work in React and TypeScript.'), 'cv.txt')}
+    response = client.post('/resume/jobs?format=json&k=1', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert [m['title'] for m in response.get_json()['matches']] == ['Frontend Developer']
+
+
+def test_job_vectors_stored_on_post_and_dropped_on_delete(jobs_db, monkeypatch, tmp_path):
+    from extensions.ai import ats_model, job_vectors
+    from extensions.ai.job_ranker import rank_jobs
+    from models import db, Job, JobVector
+    ats_model.fit_vectorizer([ats_model.job_document(job) for job in Job.query.all()],
+                             path=str(tmp_path / 'ats_tfidf.joblib'))
+    client = jobs_db.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    client.post('/admin/post_job', data={'job_title': 'Backend Developer', 'company': 'Acme',
+                                         'job_description': 'Python and Django APIs with SQL.'})
+    job = Job.query.filter_by(title='Backend Developer').one()
+    assert job.vector.model_version == ats_model.model_version()
+    assert 'python' in job_vectors.job_skills([job])[job.id]
+
+    # Ranking reads the stored rows (the older postings are vectorized once)
+    rank_jobs('Django developer')
+    monkeypatch.setattr(job_vectors, 'vectorize_jobs', None)
+    db.session.add(JobVector(job_id=999))  # an orphan row is never ranked
+    db.session.commit()
+    assert rank_jobs('Python Django APIs', k=1)[0][0] == job.id
+
+    client.post('/admin/delete_job', data={'job_id': job.id})
+    assert JobVector.query.get(job.id) is None
+    assert job.id not in [job_id for job_id, _ in rank_jobs('Python Django APIs')]
+
+
+def test_refit_by_another_process_is_reloaded_not_reverted(jobs_db, monkeypatch, tmp_path):
+    import os
+    import joblib
+    from extensions.ai import ats_model, job_vectors
+    from extensions.ai.tfidf_store import file_version
+    from models import Job, JobVector
+    path = str(tmp_path / 'ats_tfidf.joblib')
+    ats_model.fit_vectorizer([ats_model.job_document(job) for job in Job.query.all()], path=path)
+    old_version = ats_model.model_version()
+    job_vectors.refresh_stale()
+
+    # Another worker refits: only the file changes, not this process's globals
+    refit = ats_model.make_vectorizer().fit(['Go and Kubernetes platform engineer.'] +
+                                            [ats_model.job_document(job) for job in Job.query.all()])
+    joblib.dump(refit, path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    new_version = file_version(path)
+    assert new_version != old_version
+
+    job_vectors.load_matrix()
+    assert ats_model.model_version() == new_version
+    assert {row.model_version for row in JobVector.query} == {new_version}
+
+
+def test_delete_then_post_reusing_the_id_is_ranked(jobs_db):
+    from extensions.ai.job_ranker import rank_jobs
+    from models import Job
+    client = jobs_db.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    last = Job.query.order_by(Job.id.desc()).first().id
+    rank_jobs('Python developer')
+    client.post('/admin/delete_job', data={'job_id': last})
+    client.post('/admin/post_job', data={'job_title': 'Rust Engineer', 'company': 'Ferrous',
+                                         'job_description': 'Rust, Tokio and embedded systems.'})
+    job = Job.query.filter_by(title='Rust Engineer').one()
+    assert job.id == last  # same count and max id as before the delete
+    assert rank_jobs('Rust and Tokio embedded work', k=1)[0][0] == job.id
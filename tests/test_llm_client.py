@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _FakeOpenAI(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible server; the prompt text controls its delay."""
+
+    calls = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        type(self).calls.append(payload)
+        if self.path == '/embeddings':
+            body = {'data': [{'index': i, 'embedding': [float(len(t)), 1.0]}
+                             for i, t in reversed(list(enumerate(payload['input'])))]}
+            return self._json(body)
+
+        prompt = payload['messages'][-1]['content']
+        if prompt.startswith('sleep:'):
+            time.sleep(float(prompt.split(':')[1]))
+        if payload.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            for word in ('Do ', 'internships.'):
+                chunk = {'choices': [{'delta': {'content': word}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+        self._json({'choices': [{'message': {'content': f"echo {prompt}"}}]})
+
+    def _json(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # clients that time out leave broken pipes behind
+
+
+@pytest.fixture
+def fake_server():
+    pytest.importorskip('requests')
+    _FakeOpenAI.calls = []
+    server = _QuietServer(('127.0.0.1', 0), _FakeOpenAI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _messages(prompt):
+    return [{'role': 'user', 'content': prompt}]
+
+
+def test_chat_embed_and_stream(fake_server):
+    from extensions.ai.llm_client import LLMClient
+    client = LLMClient(api_key='k', api_base=fake_server)
+    assert client.chat(_messages('hi'), 'm') == 'echo hi'
+    assert client.embed(['a', 'abc'], 'e') == [[1.0, 1.0], [3.0, 1.0]]
+    assert list(client.chat_stream(_messages('hi'), 'm')) == ['Do ', 'internships.']
+
+
+def test_identical_concurrent_calls_are_coalesced(fake_server):
+    from extensions.ai.llm_client import LLMClient
+    client = LLMClient(api_key='k', api_base=fake_server, max_in_flight=4)
+    results = []
+
+    def ask():
+        results.append(client.chat(_messages('sleep:0.3'), 'm'))
+
+    threads = [threading.Thread(target=ask) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ['echo sleep:0.3'] * 5
+    assert len(_FakeOpenAI.calls) == 1
+    assert client.coalesced == 4
+
+
+def test_bulkhead_sheds_excess_calls(fake_server):
+    from extensions.ai.llm_client import LLMBusyError, LLMClient
+    client = LLMClient(api_key='k', api_base=fake_server, max_in_flight=1, acquire_timeout=0.05)
+    slow = threading.Thread(target=client.chat, args=(_messages('sleep:0.5'), 'm'))
+    slow.start()
+    time.sleep(0.1)
+    with pytest.raises(LLMBusyError):
+        client.chat(_messages('other question'), 'm')
+    slow.join()
+    assert client.chat(_messages('other question'), 'm') == 'echo other question'
+
+
+def test_per_call_timeout(fake_server):
+    from extensions.ai.llm_client import LLMClient, LLMTimeoutError
+    client = LLMClient(api_key='k', api_base=fake_server)
+    with pytest.raises(LLMTimeoutError):
+        client.chat(_messages('sleep:1'), 'm', timeout=0.2)
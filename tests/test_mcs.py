@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def test_score_mentors_matches_scalar_function():
+    from scipy.sparse import csr_matrix
+    from extensions.matching.mcs import avail_bitmasks, cf_scores, mentor_compatibility_score, score_mentors
+    rng = np.random.default_rng(7)
+    n, dim = 500, 12
+    mentors = rng.random((n, dim)) * (rng.random((n, dim)) < 0.4)
+    mentors[:5] = 0  # empty profiles score 0 similarity
+    tzs = rng.choice([-5.0, 0.0, 1.0, 5.5, 8.0], size=n)
+    avails = [list(rng.choice(24, size=rng.integers(0, 10), replace=False)) for _ in range(n)]
+    histories = [list(rng.random(rng.integers(0, 4))) for _ in range(n)]
+    student_vec, student_tz, student_avail = rng.random(dim), 5.5, list(range(9, 18))
+
+    expected = [mentor_compatibility_score(student_vec, mentors[i], student_tz, tzs[i], student_avail, avails[i],
+                                           histories[i]) for i in range(n)]
+    student = (student_vec, student_tz, student_avail)
+    for matrix in (mentors, csr_matrix(mentors)):
+        scores = score_mentors(student, matrix, tzs, avail_bitmasks(avails), cf_scores(histories))
+        assert scores.tolist() == expected
+    scores = score_mentors(student, mentors, tzs, avail_bitmasks(avails), cf_scores(histories),
+                           alpha=0.5, beta=0.3, gamma=0.2)
+    assert scores[10] == mentor_compatibility_score(student_vec, mentors[10], student_tz, tzs[10], student_avail,
+                                                    avails[10], histories[10], alpha=0.5, beta=0.3, gamma=0.2)
+
+
+def test_popcount_fallback_matches():
+    from extensions.matching import mcs
+    masks = mcs.avail_bitmasks([[0, 1, 63], [], list(range(24))])
+    assert mcs._BYTE_POPCOUNT[masks.view(np.uint8).reshape(-1, 8)].sum(axis=1).tolist() == [3, 0, 24]
+    assert mcs._popcount(masks).tolist() == [3, 0, 24]
+
+
+def test_top_k_ranks_rows_like_single_arrays():
+    import numpy as np
+    from extensions.ai.ranking import top_k
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.8, 0.2, 0.6, 0.4]], dtype=np.float32)
+    assert top_k(scores[0], 2).tolist() == [1, 3]
+    assert top_k(scores, 2).tolist() == [top_k(row, 2).tolist() for row in scores]
+    assert top_k(scores, 10).tolist() == [[1, 3, 2, 0], [0, 2, 3, 1]]
+    assert top_k(scores[0], 0).size == 0
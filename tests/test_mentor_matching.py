@@ -0,0 +1,173 @@
+import pytest
+
+
+@pytest.fixture
+def mentors_db(monkeypatch, tmp_path):
+    import numpy as np
+    from extensions.ai.tfidf_store import PersistedModel
+    from extensions.matching import mentor_vectors
+    from app import app as flask_app
+    from models import db, User
+    monkeypatch.setattr(mentor_vectors, '_model', PersistedModel(str(tmp_path / 'mentor_tfidf.joblib')))
+    monkeypatch.setattr(mentor_vectors, '_state', (None, None, None, np.empty(0, dtype=np.int64)))
+    monkeypatch.setattr(mentor_vectors, '_reconciled_at', None)
+    monkeypatch.setitem(flask_app.config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'mentors.db'}")
+    with flask_app.app_context():
+        db.create_all()
+        db.session.add(User(username='student', email='s@example.com', role='student',
+                            course='machine learning with python'))
+        # More than the old .limit(20); the best match comes last
+        db.session.add_all([
+            User(username=f'alum{i}', email=f'a{i}@example.com', role='alumni', course=f'history topic{i}')
+            for i in range(30)
+        ])
+        db.session.add(User(username='ml_alum', email='ml@example.com', role='alumni',
+                            course='machine learning'))
+        db.session.add(User(username='web_alum', email='web@example.com', role='alumni',
+                            course='python web development'))
+        db.session.add(User(username='teacher', email='t@example.com', role='teacher',
+                            course='machine learning python'))
+        db.session.commit()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_recommendations_cover_all_alumni(mentors_db):
+    from extensions.matching.db_mcs import get_recommendations_for_student
+    from models import db, User
+    student = User.query.filter_by(username='student').one()
+    recs = get_recommendations_for_student(student.id, num_recommendations=3)
+    assert recs[0]['mentor_name'] == 'ml_alum'
+    assert abs(recs[0]['compatibility_score'] - (0.7 * recs[0]['skill_match'] + 15)) < 0.1
+    assert all(r['mentor_name'] != 'teacher' for r in recs)
+
+    # New alumni are picked up without a restart; the student is never their own mentor
+    from extensions.matching.mentor_vectors import vectorize_users
+    new_alum = User(username='python_alum', email='p@example.com', role='alumni',
+                    course='machine learning with python')
+    db.session.add(new_alum)
+    student.role = 'alumni'
+    vectorize_users([new_alum, student])
+    db.session.commit()
+    names = [r['mentor_name'] for r in get_recommendations_for_student(student.id, num_recommendations=5)]
+    assert names[0] == 'python_alum' and 'student' not in names
+
+
+def test_profile_edit_refreshes_only_that_row(mentors_db, monkeypatch):
+    from extensions.matching import mentor_vectors
+    from extensions.matching.db_mcs import get_recommendations_for_student
+    from models import User, MentorVector
+    student = User.query.filter_by(username='student').one()
+    get_recommendations_for_student(student.id)
+    assert MentorVector.query.count() == 32
+    version = MentorVector.query.get(User.query.filter_by(username='alum0').one().id).updated_at
+
+    # From here on nothing may be refitted or reloaded wholesale
+    monkeypatch.setattr(mentor_vectors, 'rebuild', None)
+    full_loads = []
+    load_rows = mentor_vectors._load_rows
+    monkeypatch.setattr(mentor_vectors, '_load_rows',
+                        lambda *a, **kw: full_loads.append(kw.get('since')) or load_rows(*a, **kw))
+
+    client = mentors_db.test_client()
+    alum = User.query.filter_by(username='alum5').one()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(alum.id)
+    client.post('/update_profile', data={'email': alum.email, 'course': 'deep machine learning with python'})
+    recs = get_recommendations_for_student(student.id)
+    assert recs[0]['mentor_name'] == 'alum5'
+    assert full_loads and all(since is not None for since in full_loads)
+    assert MentorVector.query.get(User.query.filter_by(username='alum0').one().id).updated_at == version
+
+    # A deleted mentor is dropped at once, before the next full reconcile
+    from models import db
+    db.session.delete(User.query.filter_by(username='alum5').one())
+    db.session.commit()
+    assert 'alum5' not in [r['mentor_name'] for r in get_recommendations_for_student(student.id)]
+
+
+def test_materialized_recommendations_served_until_profile_changes(mentors_db, monkeypatch):
+    from extensions.matching import db_mcs
+    from extensions.matching.batch import materialize
+    from models import db, User, MentorRecommendation
+    student = User.query.filter_by(username='student').one()
+    live = db_mcs.get_recommendations_for_student(student.id, num_recommendations=3)
+
+    run = materialize(top_n=5, block_size=1)
+    run_id = run.id
+    assert run.students == 1 and MentorRecommendation.query.filter_by(student_id=student.id).count() == 5
+
+    # Served from the table: the live path is not touched
+    live_calls = []
+    ensure_matrix = db_mcs.ensure_matrix
+    monkeypatch.setattr(db_mcs, 'ensure_matrix', lambda: live_calls.append(1) or ensure_matrix())
+    # (only the top two have non-zero similarity; ties among the rest are unordered)
+    assert db_mcs.get_recommendations_for_student(student.id, num_recommendations=3)[:2] == live[:2]
+    assert live_calls == []
+
+    # A changed profile is scored live until the next run
+    student = User.query.filter_by(username='student').one()
+    student.course = 'python web development'
+    db.session.commit()
+    assert db_mcs.get_recommendations_for_student(student.id)[0]['mentor_name'] == 'web_alum'
+    assert live_calls == [1]
+
+    assert materialize(top_n=5).id != run_id
+    assert MentorRecommendation.query.filter_by(run_id=run_id).count() == 0
+
+
+def test_profile_outside_vocabulary_gets_no_stored_recommendations(mentors_db):
+    from extensions.matching import db_mcs
+    from extensions.matching.batch import materialize
+    from models import db, User, MentorRecommendation
+    db_mcs.get_recommendations_for_student(1)  # fits the model on the mentors
+    student = User.query.filter_by(username='student').one()
+    student.course = 'quantum basketweaving'
+    db.session.commit()
+    assert db_mcs.get_recommendations_for_student(student.id) == []
+
+    materialize(top_n=5)
+    assert MentorRecommendation.query.filter_by(student_id=student.id).count() == 0
+    assert db_mcs.get_recommendations_for_student(student.id) == []
+
+
+def test_refit_by_another_process_is_reloaded_not_reverted(mentors_db, monkeypatch):
+    import os
+    import joblib
+    from extensions.ai.tfidf_store import file_version
+    from extensions.matching import mentor_vectors
+    from models import db, User, MentorVector
+    mentor_vectors.ensure_matrix()
+    old_version = mentor_vectors.get_model()[1]
+    path = mentor_vectors._model.path
+
+    # Another worker refits: only the file changes, not this process's globals
+    mentors = User.query.filter(User.role.in_(mentor_vectors.MENTOR_ROLES)).all()
+    refit, _ = mentor_vectors.build_mentor_matrix(
+        ['rust systems programming'] + [mentor_vectors.profile_text(user) for user in mentors])
+    joblib.dump(refit, path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    new_version = file_version(path)
+    assert new_version != old_version
+
+    alum = User.query.filter_by(username='alum0').one()
+    mentor_vectors.vectorize_users([alum])
+    db.session.commit()
+    assert alum.mentor_vector.model_version == new_version
+    monkeypatch.setattr(mentor_vectors, '_reconciled_at', None)
+    vect, matrix, ids = mentor_vectors.ensure_matrix()
+    assert mentor_vectors.get_model()[1] == new_version
+    assert {row.model_version for row in MentorVector.query} == {new_version}
+    assert matrix.shape == (32, len(vect.vocabulary_))
+
+
+def test_refit_over_unchanged_profiles_still_succeeds(mentors_db):
+    from extensions.matching import mentor_vectors
+    from models import User
+    assert mentor_vectors.rebuild() == 32
+    assert mentor_vectors.rebuild() == 0  # same model, rows already current
+    User.query.filter(User.role.in_(mentor_vectors.MENTOR_ROLES)).update({'course': None},
+                                                                          synchronize_session=False)
+    assert mentor_vectors.rebuild() is None
@@ -0,0 +1,358 @@
+import zlib
+
+import numpy as np
+import pytest
+
+
+def _fake_embed(text):
+    rng = np.random.default_rng(zlib.crc32(text.encode('utf-8')))
+    return rng.random(1536, dtype=np.float32)
+
+
+@pytest.fixture
+def rag(monkeypatch, tmp_path):
+    pytest.importorskip('faiss')
+    from extensions.ai import rag_faiss
+    from app import app as flask_app
+    monkeypatch.setattr(rag_faiss, 'embed_text', _fake_embed)
+    monkeypatch.setattr(rag_faiss, 'embed_texts', lambda texts: np.array([_fake_embed(t) for t in texts]))
+    monkeypatch.setattr(rag_faiss, 'INDEX_DIR', str(tmp_path))
+    rag_faiss.clear_index()
+    with flask_app.app_context():
+        yield rag_faiss
+    rag_faiss.clear_index()
+
+
+def test_save_and_load_index_roundtrip(rag, tmp_path):
+    rag.add_document('advice_1', 'Focus on internships and practical projects.')
+    rag.add_document('advice_2', 'Learn Python and SQL for data roles.')
+    version = rag.save_index()
+
+    rag.clear_index()
+    assert rag.load_index()
+    assert rag._snapshot_version == version
+    assert [d['id'] for d in rag._documents] == ['advice_1', 'advice_2']
+
+    _, ids = rag._index.search(np.array([_fake_embed('Learn Python and SQL for data roles.')]), 1)
+    assert ids[0][0] == 1
+
+    # Writing to a memory-mapped snapshot must switch to an owned copy, even
+    # after another process pruned the snapshot's files
+    import shutil
+    shutil.rmtree(tmp_path / f"v{version:06d}")
+    rag.add_document('advice_3', 'Network with alumni during events.')
+    assert rag._index.ntotal == 3
+    assert rag._index_path is None
+
+
+def test_save_index_prunes_old_snapshots(rag, tmp_path, monkeypatch):
+    monkeypatch.setattr(rag, 'INDEX_KEEP', 2)
+    rag.add_document('advice_1', 'Focus on internships and practical projects.')
+    versions = [rag.save_index() for _ in range(3)]
+    snapshots = sorted(p.name for p in tmp_path.iterdir() if p.name.startswith('v'))
+    assert snapshots == [f"v{v:06d}" for v in versions[-2:]]
+    assert (tmp_path / 'CURRENT').read_text() == str(versions[-1])
+
+
+def test_add_documents_batches(rag):
+    docs = ((f"advice_{i}", f"advice text number {i}", {'n': i}) for i in range(10))
+    batches = []
+    count = rag.add_documents(docs, batch_size=4, on_batch=batches.append)
+
+    assert count == 10
+    assert [b['size'] for b in batches] == [4, 4, 2]
+    assert batches[-1]['total'] == 10
+    assert rag._index.ntotal == len(rag._documents) == 10
+    assert rag._documents[7] == {'id': 'advice_7', 'chunk': 0, 'text': 'advice text number 7', 'meta': {'n': 7}}
+
+
+def test_embedding_cache_lru_eviction(tmp_path):
+    from extensions.ai.embedding_cache import EmbeddingCache
+    cache = EmbeddingCache(str(tmp_path / 'emb.sqlite3'), max_entries=2)
+    cache.put_many('m', ['a', 'b'], [np.ones(4), np.zeros(4)])
+    assert set(cache.get_many('m', ['a'])) == {'a'}  # 'a' is now most recently used
+    cache.put_many('m', ['c'], [np.full(4, 2.0)])
+
+    assert len(cache) == 2
+    assert set(cache.get_many('m', ['a', 'b', 'c'])) == {'a', 'c'}
+    assert cache.get_many('other-model', ['a']) == {}
+
+
+def test_embed_texts_only_requests_cache_misses(monkeypatch, tmp_path):
+    from extensions.ai import rag_faiss
+    from app import app as flask_app
+    requested = []
+
+    def fake_request(texts):
+        requested.append(list(texts))
+        return np.array([_fake_embed(t) for t in texts])
+
+    monkeypatch.setattr(rag_faiss, '_request_embeddings', fake_request)
+    monkeypatch.setattr(rag_faiss, 'EMBED_CACHE_PATH', str(tmp_path / 'emb.sqlite3'))
+    monkeypatch.setattr(rag_faiss, '_embedding_cache', None)
+    with flask_app.app_context():
+        first = rag_faiss.embed_texts(['how do I prepare for interviews', 'resume tips'])
+        again = rag_faiss.embed_texts(['resume tips', 'networking', 'resume tips'])
+        assert np.array_equal(rag_faiss.embed_text('how do I prepare for interviews'), first[0])
+
+    assert requested == [['how do I prepare for interviews', 'resume tips'], ['networking']]
+    assert np.array_equal(again[0], first[1])
+    assert again.shape == (3, 1536)
+
+
+def test_query_rag_result_cache_invalidated_by_index_changes(rag, monkeypatch):
+    from types import SimpleNamespace
+    calls = []
+
+    def fake_chat(messages, model, **kwargs):
+        calls.append(messages)
+        return f"answer {len(calls)}"
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(rag, 'get_llm_client', lambda: SimpleNamespace(chat=fake_chat))
+    rag.add_document('advice_1', 'Focus on internships and practical projects.')
+    before = rag.query_cache_stats()
+
+    assert rag.query_rag('How do I prepare for interviews?', k=1) == ('answer 1', ['advice_1'])
+    assert rag.query_rag('  how do I prepare  for interviews ', k=1) == ('answer 1', ['advice_1'])
+    assert len(calls) == 1
+    stats = rag.query_cache_stats()
+    assert stats['hits'] - before['hits'] == 1
+    assert stats['misses'] - before['misses'] == 1
+
+    rag.add_document('advice_2', 'Learn Python and SQL for data roles.')
+    assert rag.query_rag('How do I prepare for interviews?', k=1)[0] == 'answer 2'
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('kind', ['ivf', 'hnsw'])
+def test_configurable_index_type(rag, monkeypatch, kind):
+    from extensions.ai.ann_index import index_kind
+    monkeypatch.setattr(rag, 'INDEX_TYPE', kind)
+    monkeypatch.setattr(rag, 'IVF_MIN_DOCS', 100)
+    rag.add_documents((f"advice_{i}", f"advice text number {i}") for i in range(120))
+
+    assert index_kind(rag._index) == kind
+    _, ids = rag._index.search(np.array([_fake_embed('advice text number 42')]), 1)
+    assert ids[0][0] == 42
+
+    rag.save_index()
+    rag.clear_index()
+    rag.load_index()
+    assert index_kind(rag._index) == kind
+    assert rag._index.ntotal == 120
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    from extensions.ai.embedders import HashingEmbedder
+    embedder = HashingEmbedder(dim=256)
+    vecs = embedder.embed(['Learn Python and SQL', 'Learn Python and SQL', 'network at events'])
+    assert vecs.shape == (3, 256) and vecs.dtype == np.float32
+    assert np.array_equal(vecs[0], vecs[1])
+    assert np.allclose(np.linalg.norm(vecs, axis=1), 1.0)
+
+
+def test_query_rag_offline_with_local_embedder(monkeypatch, tmp_path):
+    pytest.importorskip('faiss')
+    from extensions.ai import rag_faiss
+    from extensions.ai.embedders import HashingEmbedder
+    from app import app as flask_app
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(rag_faiss, 'INDEX_DIR', str(tmp_path))
+    monkeypatch.setattr(rag_faiss, '_embedder', HashingEmbedder(dim=256))
+    rag_faiss.clear_index()
+    with flask_app.app_context():
+        rag_faiss.add_documents([
+            ('advice_1', 'Focus on internships and practical projects.'),
+            ('advice_2', 'Learn Python and SQL for data roles.'),
+            ('advice_3', 'Network with alumni during events.'),
+        ])
+        assert rag_faiss._index.d == 256
+        answer, sources = rag_faiss.query_rag('Which skills like SQL should I learn for data roles?', k=1)
+    rag_faiss.clear_index()
+    assert sources == ['advice_2']
+    assert answer == 'Learn Python and SQL for data roles.'
+
+
+def test_bm25_ranks_by_term_weight():
+    from extensions.ai.bm25 import BM25Index, tokenize
+    assert tokenize('How do I learn C++ and C#?') == ['learn', 'c++', 'c#']
+    index = BM25Index()
+    index.add('Focus on internships and practical projects.')
+    index.add('Learn Python and SQL for data roles. SQL matters.')
+    index.add('Network with alumni during events.')
+
+    assert [pos for pos, _ in index.search('sql python', k=3)] == [1]
+    assert [pos for pos, _ in index.search('alumni internships', k=1)] in ([0], [2])
+    assert index.search('the of and', k=3) == []
+
+
+def test_query_rag_keyword_fallback_uses_bm25(rag, monkeypatch):
+    from types import SimpleNamespace
+    from extensions.ai.llm_client import LLMBusyError
+
+    def busy_chat(messages, model, **kwargs):
+        raise LLMBusyError('too many calls in flight')
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(rag, 'get_llm_client', lambda: SimpleNamespace(chat=busy_chat))
+    rag.add_documents([
+        ('advice_1', 'Focus on internships and practical projects.'),
+        ('advice_2', 'Learn Python and SQL for data roles.'),
+    ])
+    answer, sources = rag.query_rag('Should I learn SQL?', k=3)
+    assert sources == ['advice_2']
+    assert answer == 'Learn Python and SQL for data roles.'
+
+
+def test_ask_rag_stream_sends_sources_then_tokens(rag, monkeypatch):
+    import json
+    from types import SimpleNamespace
+    from app import app as flask_app
+
+    def fake_chat_stream(messages, model, **kwargs):
+        yield 'Do '
+        yield 'internships.'
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(rag, 'get_llm_client', lambda: SimpleNamespace(chat_stream=fake_chat_stream))
+    rag.add_document('advice_1', 'Focus on internships and practical projects.')
+
+    response = flask_app.test_client().post('/ask/rag/stream', json={'query': 'internships?'})
+    assert response.mimetype == 'text/event-stream'
+    events = [
+        (block.split('\n')[0][len('event: '):], json.loads(block.split('\n')[1][len('data: '):]))
+        for block in response.get_data(as_text=True).split('\n\n') if block.startswith('event:')
+    ]
+    assert events == [
+        ('sources', {'query': 'internships?', 'sources': ['advice_1']}),
+        ('token', {'text': 'Do '}),
+        ('token', {'text': 'internships.'}),
+        ('done', {}),
+    ]
+    # The streamed answer is cached for the blocking endpoint too
+    assert rag.query_rag('internships', k=3) == ('Do internships.', ['advice_1'])
+
+
+def test_read_write_lock_readers_share_writers_exclude():
+    import threading
+    from extensions.ai.rwlock import ReadWriteLock
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=2)
+    order = []
+
+    def reader():
+        with lock.read():
+            both_reading.wait()  # deadlocks unless two readers hold the lock at once
+            order.append('read')
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+
+    with lock.write():
+        with lock.write(), lock.read():  # reentrant for the writing thread
+            order.append('write')
+    assert order == ['read', 'read', 'write']
+
+
+_OTHER_WORKER = r'''
+import sys, zlib
+import numpy as np
+sys.path.insert(0, sys.argv[1])
+from app import app
+from extensions.ai import rag_faiss as rag
+
+def embed(texts):
+    return np.array([np.random.default_rng(zlib.crc32(t.encode())).random(1536, dtype=np.float32) for t in texts])
+
+rag.embed_texts = embed
+rag.INDEX_DIR = sys.argv[2]
+with app.app_context():
+    rag.load_index()
+    rag.add_documents([('advice_2', 'Learn Python and SQL for data roles.')])
+    print(rag.save_index())
+'''
+
+
+def test_worker_hot_reloads_snapshot_saved_by_another_process(rag, tmp_path):
+    import os
+    import subprocess
+    import sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    rag.add_document('advice_1', 'Focus on internships and practical projects.')
+    version = rag.save_index()
+    rag.clear_index()
+    rag.load_index()
+    assert not rag.maybe_reload_index(force=True)
+
+    out = subprocess.run([sys.executable, '-c', _OTHER_WORKER, root, str(tmp_path)],
+                         capture_output=True, text=True, check=True, cwd=root)
+    assert int(out.stdout.split()[-1]) == version + 1
+
+    assert rag.maybe_reload_index(force=True)
+    assert rag._snapshot_version == version + 1
+    assert [d['id'] for d in rag._documents] == ['advice_1', 'advice_2']
+    assert rag._index_path is not None  # mapped, not re-embedded
+
+
+def test_chunk_text_windows_stay_within_paragraphs():
+    from extensions.ai.chunking import chunk_text
+    assert chunk_text('short advice', size=5, overlap=2) == ['short advice']
+    text = 'a b c d e f g\n\nh i j'
+    assert chunk_text(text, size=4, overlap=1) == ['a b c d', 'd e f g', 'h i j']
+
+
+def test_update_reembeds_only_changed_chunks_and_delete(rag, monkeypatch):
+    embedded = []
+
+    def counting_embed(texts):
+        embedded.extend(texts)
+        return np.array([_fake_embed(t) for t in texts])
+
+    monkeypatch.setattr(rag, 'embed_texts', counting_embed)
+    monkeypatch.setattr(rag, 'chunk_text', lambda text: text.split('\n\n'))
+    monkeypatch.setattr(rag, 'COMPACT_RATIO', 0.9)
+    post = 'Do internships early.\n\nLearn SQL.\n\nNetwork at events.'
+    rag.add_document('answer_1', post, {'author': 'A'})
+    rag.add_document('answer_2', 'Practice mock interviews.')
+    assert len(embedded) == 4
+
+    embedded.clear()
+    rag.update_document('answer_1', post.replace('Learn SQL.', 'Learn SQL and Python.'), {'author': 'A'})
+    assert embedded == ['Learn SQL and Python.']
+    assert [rag._documents[row]['text'] for row in rag._doc_rows['answer_1']] == [
+        'Do internships early.', 'Learn SQL and Python.', 'Network at events.']
+    _, ids = rag._index.search(np.array([_fake_embed('Learn SQL.')]), 1)
+    assert rag._documents[ids[0][0]] is None  # old chunk is tombstoned
+
+    with rag._lock.read():
+        hits = rag._search_rows(_fake_embed('Learn SQL.'), 2)
+    assert sorted(d['id'] for d in hits) == ['answer_1', 'answer_2']
+
+    assert rag.delete_document('answer_2')
+    assert not rag.delete_document('answer_2')
+    assert [d['id'] for d in rag.keyword_search('mock interviews', k=3)] == []
+
+    rag.compact_index()
+    assert rag._index.ntotal == len(rag._documents) == 3
+    assert rag._tombstones == 0
+    assert [d['chunk'] for d in rag._documents] == [0, 2, 1]
+
+
+def test_query_without_faiss_returns_empty_index_answer(monkeypatch, tmp_path):
+    import sys
+    from extensions.ai import rag_faiss
+    from extensions.ai.embedders import make_embedder
+    from extensions.ai.lazy import lazy_import
+    from app import app as flask_app
+    monkeypatch.setitem(sys.modules, 'faiss', None)  # import faiss raises ImportError
+    monkeypatch.setattr(rag_faiss, 'faiss', lazy_import('faiss'))
+    monkeypatch.setattr(rag_faiss, '_embedder', make_embedder('hashing'))
+    monkeypatch.setattr(rag_faiss, 'INDEX_DIR', str(tmp_path))
+    rag_faiss.clear_index()
+    with flask_app.app_context():
+        answer, sources = rag_faiss.query_rag('How do I get an internship?')
+    assert answer == rag_faiss._EMPTY_INDEX_ANSWER and sources == []
@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+
+@pytest.fixture
+def queue(monkeypatch, tmp_path):
+    from extensions.resume import store, task_queue, views as resume_views
+    monkeypatch.setattr(resume_views, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(store, '_cache', store.ExtractionCache(str(tmp_path / 'cache.sqlite3')))
+    monkeypatch.setattr(task_queue, '_queue', task_queue.TaskQueue(str(tmp_path / 'tasks.sqlite3')))
+    monkeypatch.setattr(task_queue, 'QUEUE_MODE', 'external')
+    return task_queue._queue
+
+
+def test_upload_returns_task_then_score(queue):
+    from app import app as flask_app
+    from extensions.resume.task_queue import work_once
+    client = flask_app.test_client()
+    body = b'Experience: Python and SQL. Education: BSc. Skills: Docker.'
+    response = client.post('/resume/?format=json', data={'resume': (io.BytesIO(body), 'cv.txt')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 202
+    task_id = response.get_json()['task_id']
+
+    status = client.get(f'/resume/tasks/{task_id}?format=json').get_json()
+    assert status['status'] == 'queued' and 'score' not in status
+    assert b'being analyzed' in client.get(f'/resume/tasks/{task_id}').data
+
+    assert work_once(flask_app) and not work_once(flask_app)
+    status = client.get(f'/resume/tasks/{task_id}?format=json').get_json()
+    assert status['status'] == 'done' and status['filename'] == 'cv.txt'
+    assert 0 <= status['score'] <= 100
+    assert b'ATS-like Score' in client.get(f'/resume/tasks/{task_id}').data
+    assert client.get('/resume/tasks/nope?format=json').status_code == 404
+
+
+def test_expired_lease_is_reclaimed_then_failed(queue, monkeypatch):
+    from extensions.resume import task_queue
+    monkeypatch.setattr(task_queue, 'LEASE_SECONDS', -1)  # every claim is already expired
+    monkeypatch.setattr(task_queue, 'MAX_ATTEMPTS', 2)
+    task_id = queue.enqueue({'filename': 'a.txt'})
+    assert queue.claim()[2] == 1
+    assert queue.claim()[2] == 2  # the first worker "died"
+    assert queue.claim() is None
+    task = queue.get(task_id)
+    assert task['status'] == task_queue.FAILED and task['attempts'] == 2
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    from extensions.resume import store, task_queue, views as resume_views
+    from app import app as flask_app
+    monkeypatch.setattr(resume_views, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(store, '_cache', store.ExtractionCache(str(tmp_path / 'cache.sqlite3')))
+    monkeypatch.setattr(task_queue, '_queue', task_queue.TaskQueue(str(tmp_path / 'tasks.sqlite3')))
+    monkeypatch.setattr(task_queue, 'QUEUE_MODE', 'external')  # drained by the test
+    return flask_app.test_client()
+
+
+def _drain():
+    from app import app as flask_app
+    from extensions.resume.task_queue import work_once
+    while work_once(flask_app):
+        pass
+
+
+def _stored_files(tmp_path):
+    return sorted(p.name for p in (tmp_path / 'uploads').rglob('*') if p.is_file())
+
+
+def test_uploads_are_content_addressed(client, tmp_path):
+    import hashlib
+    for name, body in (('cv.txt', b'Python developer'), ('copy.txt', b'Python developer'),
+                       ('cv.txt', b'SQL analyst')):
+        client.post('/resume/', data={'resume': (io.BytesIO(body), name)},
+                    content_type='multipart/form-data')
+    # Same bytes stored once; same name with new bytes does not overwrite
+    assert _stored_files(tmp_path) == sorted(
+        f"{hashlib.sha256(body).hexdigest()}.txt" for body in (b'Python developer', b'SQL analyst'))
+
+
+def test_resubmitted_resume_skips_parsing(client, monkeypatch):
+    from extensions.ai import ats
+    calls = []
+    extract = ats.extract_document
+
+    def counting_extract(path):
+        calls.append(path)
+        return extract(path)
+    monkeypatch.setattr(ats, 'extract_document', counting_extract)
+
+    body = b'Experience: Python and SQL. Education: BSc. Skills: Docker.'
+    for job in ('Python developer', 'Data engineer with SQL'):
+        response = client.post('/resume/', data={'resume': (io.BytesIO(body), 'cv.txt'), 'job_description': job},
+                               content_type='multipart/form-data')
+        assert response.status_code == 302
+        _drain()
+    assert len(calls) == 1
+
+    from extensions.resume.store import file_digest, get_extraction_cache
+    text, skills, _, partial_reason = get_extraction_cache().get(file_digest(calls[0]))
+    assert text == body.decode() and skills == ['python', 'sql', 'docker'] and partial_reason is None